@@ -1,20 +1,24 @@
-from datetime import timedelta
+import asyncio
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
+from app.core.password import get_password_hash, verify_password
 from app.core.security import create_access_token, get_current_user
-from app.core.settings import get_settings
 from app.models.user import User
 from app.schemas.token import Token
 from app.schemas.user import UserCreate, UserResponse
 
-settings = get_settings()
 router = APIRouter()
 
+# Verified against when the email is unknown, so both failure paths cost
+# one hash check and response timing does not reveal registered emails
+_DUMMY_HASH = get_password_hash("dummy-password-for-timing")
+
 
 @router.post("/login", response_model=Token)
 async def login(
@@ -25,7 +29,12 @@ async def login(
     OAuth2 compatible token login, get an access token for future requests.
     """
     user = await User.get_by_email(db, email=form_data.username)
-    if not user or not user.verify_password(form_data.password):
+    hashed_password = user.hashed_password if user else _DUMMY_HASH
+    # bcrypt takes tens of milliseconds; keep it off the event loop
+    password_ok = await asyncio.to_thread(
+        verify_password, form_data.password, hashed_password
+    )
+    if not user or not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -37,24 +46,21 @@ async def login(
             detail="Inactive user",
         )
 
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    return {
-        "access_token": create_access_token(
-            user.id, expires_delta=access_token_expires
-        ),
-        "token_type": "bearer",
-    }
+    # The default lifetime is ACCESS_TOKEN_EXPIRE_MINUTES. The body is two
+    # strings, so return it directly rather than validating it as a Token
+    return ORJSONResponse(
+        {"access_token": create_access_token(user.id), "token_type": "bearer"}
+    )
 
 
-@router.post("/login/", response_model=Token)
-async def login_with_slash(
-    db: AsyncSession = Depends(get_db),
-    form_data: OAuth2PasswordRequestForm = Depends(),
-) -> Any:
-    """
-    OAuth2 compatible token login with trailing slash (for Tauri compatibility).
-    """
-    return await login(db, form_data)
+# Trailing-slash alias for Tauri compatibility
+router.add_api_route(
+    "/login/",
+    login,
+    methods=["POST"],
+    response_model=Token,
+    include_in_schema=False,
+)
 
 
 @router.post("/register", response_model=UserResponse)
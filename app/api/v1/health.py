@@ -2,12 +2,15 @@
 Health check endpoints for monitoring and deployment verification.
 """
 
+import asyncio
+import logging
 import time
 from datetime import datetime, timezone
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 import psutil
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -15,12 +18,85 @@ from app.core.database import get_db
 from app.core.settings import get_settings
 
 settings = get_settings()
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+logger = logging.getLogger("app.health")
+
+# Latest system metrics snapshot, refreshed by _refresh_system_metrics()
+_SYSTEM_CACHE: Dict[str, Any] = {"ts": 0.0, "data": None}
+
+# Cached users table row count
+_USER_COUNT_CACHE: Dict[str, Any] = {"ts": 0.0, "data": None}
+USER_COUNT_TTL = 30  # seconds
+
+# Monotonic time of the last successful readiness database check
+_READY_CACHE: Dict[str, float] = {"ts": 0.0}
+READINESS_TTL = 5  # seconds
+
+_UTC = timezone.utc
+
+# Host boot time never changes while the process is running
+_BOOT_TIME = psutil.boot_time()
 
 
 def get_utc_timestamp() -> str:
     """Get current UTC timestamp as ISO string for API responses."""
-    return datetime.now(timezone.utc).isoformat()
+    return datetime.fromtimestamp(time.time(), _UTC).isoformat()
+
+
+def _sample_system_metrics() -> Dict[str, Any]:
+    """Collect memory, disk and CPU usage in a single pass."""
+    memory = psutil.virtual_memory()
+    disk = psutil.disk_usage("/")
+
+    return {
+        "memory": {
+            "total_gb": round(memory.total / (1024**3), 2),
+            "available_gb": round(memory.available / (1024**3), 2),
+            "percent_used": memory.percent,
+        },
+        "disk": {
+            "total_gb": round(disk.total / (1024**3), 2),
+            "free_gb": round(disk.free / (1024**3), 2),
+            "percent_used": round((disk.used / disk.total) * 100, 2),
+            "percent": disk.percent,
+        },
+        # Non-blocking: usage since the previous call
+        "cpu_percent": psutil.cpu_percent(interval=None),
+    }
+
+
+def _store_system_metrics() -> Dict[str, Any]:
+    """Sample system metrics and store them in the module cache."""
+    data = _sample_system_metrics()
+    _SYSTEM_CACHE["data"] = data
+    _SYSTEM_CACHE["ts"] = time.time()
+    return data
+
+
+def get_system_snapshot() -> Dict[str, Any]:
+    """
+    Get the cached system metrics snapshot.
+
+    Falls back to sampling on demand when the background sampler
+    has not populated the cache yet.
+    """
+    data: Optional[Dict[str, Any]] = _SYSTEM_CACHE["data"]
+    if data is None:
+        data = _store_system_metrics()
+    return data
+
+
+async def _refresh_system_metrics() -> None:
+    """Background task that periodically refreshes the system metrics cache."""
+    # Prime cpu_percent so the first real sample has a baseline
+    psutil.cpu_percent(interval=None)
+
+    while True:
+        try:
+            _store_system_metrics()
+        except Exception as e:
+            logger.warning("Failed to sample system metrics: %s", e)
+        await asyncio.sleep(settings.HEALTH_SAMPLE_INTERVAL)
 
 
 @router.get("/")
@@ -40,68 +116,105 @@ async def health_check():
     return {"status": "healthy", "timestamp": get_utc_timestamp()}
 
 
-@router.get("/health/detailed")
-async def detailed_health_check(db: AsyncSession = Depends(get_db)) -> Dict[str, Any]:
-    """Detailed health check with system and database information."""
-    if not settings.HEALTH_CHECK_ENABLED:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Health check endpoint is disabled",
+async def _get_user_count(db: AsyncSession) -> int:
+    """
+    Get the number of users, cached for USER_COUNT_TTL seconds.
+
+    On PostgreSQL the planner estimate from pg_class is used instead of a
+    full COUNT(*) scan; other databases fall back to an exact count.
+    """
+    now = time.time()
+    if (
+        _USER_COUNT_CACHE["data"] is not None
+        and now - _USER_COUNT_CACHE["ts"] < USER_COUNT_TTL
+    ):
+        return _USER_COUNT_CACHE["data"]
+
+    count = -1
+    if db.get_bind().dialect.name == "postgresql":
+        result = await db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE relname = 'users'")
         )
+        count = result.scalar() or 0
+
+    # Table never analyzed (reltuples = -1) or not PostgreSQL
+    if count < 0:
+        result = await db.execute(text("SELECT COUNT(*) FROM users"))
+        count = result.scalar()
+
+    _USER_COUNT_CACHE["data"] = count
+    _USER_COUNT_CACHE["ts"] = now
+    return count
 
-    start_time = time.time()
-    health_data = {
-        "status": "healthy",
-        "timestamp": get_utc_timestamp(),
-        "service": {
-            "name": "ISMS API",
-            "version": settings.VERSION,
-            "environment": settings.ENV_MODE,
-        },
-        "checks": {},
-    }
 
-    # Database health check
+async def _check_db(db: AsyncSession) -> Dict[str, Any]:
+    """Check database connectivity and basic table access."""
     try:
         db_start = time.time()
         await db.execute(text("SELECT 1"))
         db_time = (time.time() - db_start) * 1000
 
         # Check user table
-        user_count = await db.execute(text("SELECT COUNT(*) FROM users"))
-        user_total = user_count.scalar()
+        user_total = await _get_user_count(db)
 
-        health_data["checks"]["database"] = {
+        return {
             "status": "healthy",
             "response_time_ms": round(db_time, 2),
             "connection": "active",
             "users_count": user_total,
         }
     except Exception as e:
-        health_data["status"] = "unhealthy"
-        health_data["checks"]["database"] = {"status": "unhealthy", "error": str(e)}
+        return {"status": "unhealthy", "error": str(e)}
+
 
-    # System health check
+def _check_system() -> Dict[str, Any]:
+    """Check memory, disk and CPU usage."""
     try:
-        memory = psutil.virtual_memory()
-        disk = psutil.disk_usage("/")
+        system = get_system_snapshot()
 
-        health_data["checks"]["system"] = {
+        return {
             "status": "healthy",
-            "memory": {
-                "total_gb": round(memory.total / (1024**3), 2),
-                "available_gb": round(memory.available / (1024**3), 2),
-                "percent_used": memory.percent,
-            },
+            "memory": system["memory"],
             "disk": {
-                "total_gb": round(disk.total / (1024**3), 2),
-                "free_gb": round(disk.free / (1024**3), 2),
-                "percent_used": round((disk.used / disk.total) * 100, 2),
+                "total_gb": system["disk"]["total_gb"],
+                "free_gb": system["disk"]["free_gb"],
+                "percent_used": system["disk"]["percent_used"],
             },
-            "cpu_percent": psutil.cpu_percent(interval=1),
+            "cpu_percent": system["cpu_percent"],
         }
     except Exception as e:
-        health_data["checks"]["system"] = {"status": "degraded", "error": str(e)}
+        return {"status": "degraded", "error": str(e)}
+
+
+@router.get("/health/detailed")
+async def detailed_health_check(db: AsyncSession = Depends(get_db)) -> Dict[str, Any]:
+    """Detailed health check with system and database information."""
+    if not settings.HEALTH_CHECK_ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Health check endpoint is disabled",
+        )
+
+    start_time = time.time()
+    health_data = {
+        "status": "healthy",
+        "timestamp": get_utc_timestamp(),
+        "service": {
+            "name": "ISMS API",
+            "version": settings.VERSION,
+            "environment": settings.ENV_MODE,
+        },
+        "checks": {},
+    }
+
+    # The system check only reads the sampler's cached snapshot, so it runs
+    # inline rather than in a thread
+    db_check = await _check_db(db)
+    system_check = _check_system()
+    if db_check["status"] != "healthy":
+        health_data["status"] = "unhealthy"
+    health_data["checks"]["database"] = db_check
+    health_data["checks"]["system"] = system_check
 
     # Performance metrics
     total_time = (time.time() - start_time) * 1000
@@ -113,9 +226,16 @@ async def detailed_health_check(db: AsyncSession = Depends(get_db)) -> Dict[str,
 @router.get("/health/readiness")
 async def readiness_check(db: AsyncSession = Depends(get_db)):
     """Kubernetes-style readiness probe."""
+    # A recent successful check is reused so frequent probes do not each
+    # round-trip to the database; failures are never cached
+    now = time.monotonic()
+    if _READY_CACHE["ts"] and now - _READY_CACHE["ts"] < READINESS_TTL:
+        return {"status": "ready", "timestamp": get_utc_timestamp()}
+
     try:
         # Check database connectivity
         await db.execute(text("SELECT 1"))
+        _READY_CACHE["ts"] = now
 
         return {"status": "ready", "timestamp": get_utc_timestamp()}
     except Exception as e:
@@ -130,8 +250,8 @@ async def liveness_check():
     """Kubernetes-style liveness probe."""
     return {
         "status": "alive",
-        "timestamp": datetime.now(timezone.utc).isoformat(),
-        "uptime_seconds": time.time() - psutil.boot_time(),
+        "timestamp": get_utc_timestamp(),
+        "uptime_seconds": time.time() - _BOOT_TIME,
     }
 
 
@@ -145,19 +265,18 @@ async def metrics_endpoint(db: AsyncSession = Depends(get_db)):
 
     try:
         # Database metrics
-        user_count = await db.execute(text("SELECT COUNT(*) FROM users"))
-        total_users = user_count.scalar()
+        total_users = await _get_user_count(db)
 
         # System metrics
-        memory = psutil.virtual_memory()
+        system = get_system_snapshot()
 
         return {
             "timestamp": get_utc_timestamp(),
             "metrics": {
                 "users_total": total_users,
-                "memory_usage_percent": memory.percent,
-                "cpu_usage_percent": psutil.cpu_percent(interval=1),
-                "disk_usage_percent": psutil.disk_usage("/").percent,
+                "memory_usage_percent": system["memory"]["percent_used"],
+                "cpu_usage_percent": system["cpu_percent"],
+                "disk_usage_percent": system["disk"]["percent"],
             },
         }
     except Exception as e:
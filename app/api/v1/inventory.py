@@ -1,10 +1,14 @@
-from typing import Any, List
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
+from app.core.permissions import exclude_roles, require_roles
 from app.core.security import get_current_user
+from app.core.settings import get_settings
 from app.models.inventory import Product, Supplier
 from app.models.user import User, UserRole
 from app.schemas.inventory import (
@@ -16,24 +20,60 @@ from app.schemas.inventory import (
     SupplierResponse,
     SupplierUpdate,
 )
-from app.tasks.notifications import send_low_stock_notifications
+from app.tasks.notifications import schedule_low_stock_notifications
 
+settings = get_settings()
 router = APIRouter()
 
+# Role dependencies, built once and shared across routes
+_require_staff = require_roles(UserRole.ADMIN, UserRole.MANAGER)
+_no_cashiers = exclude_roles(UserRole.CASHIER)
+
+# Recipients of low stock notifications
+_MANAGER_EMAILS: tuple[str, ...] = tuple(settings.MANAGER_EMAILS)
+
+
+# List serializers, with their core schemas resolved once
+_PRODUCT_LIST = TypeAdapter(List[ProductResponse])
+_SUPPLIER_LIST = TypeAdapter(List[SupplierResponse])
+
+
+def set_next_page_header(response: Response, rows: List[Any], limit: int) -> None:
+    """Expose the keyset cursor for the next page when the page is full."""
+    if rows and len(rows) == limit:
+        response.headers["X-Next-After-Id"] = str(rows[-1].id)
+
+
+def page_response(adapter: TypeAdapter, rows: List[Any], limit: int) -> ORJSONResponse:
+    """
+    Serialize a page of rows with a list TypeAdapter.
+
+    The whole list is validated from attributes and dumped in single calls,
+    instead of FastAPI dumping and re-validating each row in Python.
+    """
+    items = adapter.validate_python(rows, from_attributes=True)
+    response = ORJSONResponse(adapter.dump_python(items, mode="json"))
+    set_next_page_header(response, rows, limit)
+    return response
+
 
 # Product routes
 @router.get("/products", response_model=List[ProductResponse])
 async def read_products(
     db: AsyncSession = Depends(get_db),
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=settings.MAX_PAGE_SIZE),
+    after_id: Optional[int] = None,
     current_user: User = Depends(get_current_user),
 ) -> Any:
     """
     Retrieve products.
+
+    Pass the X-Next-After-Id header of the previous page as after_id
+    for keyset pagination.
     """
-    products = await Product.get_all(db, skip=skip, limit=limit)
-    return products
+    products = await Product.get_all(db, skip=skip, limit=limit, after_id=after_id)
+    return page_response(_PRODUCT_LIST, products, limit)
 
 
 @router.post("/products", response_model=ProductResponse)
@@ -41,25 +81,17 @@ async def create_product(
     *,
     db: AsyncSession = Depends(get_db),
     product_in: ProductCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(_no_cashiers),
 ) -> Any:
     """
     Create new product.
     """
-    if current_user.role == UserRole.CASHIER:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions",
-        )
-
-    product = await Product.get_by_sku(db, sku=product_in.sku)
-    if product:
+    product = await Product.create_if_sku_free(db, obj_in=product_in.model_dump())
+    if not product:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="A product with this SKU already exists",
         )
-
-    product = await Product.create(db, obj_in=product_in.model_dump())
     return product
 
 
@@ -67,20 +99,17 @@ async def create_product(
 async def read_low_stock_products(
     db: AsyncSession = Depends(get_db),
     skip: int = 0,
-    limit: int = 100,
-    current_user: User = Depends(get_current_user),
+    limit: int = Query(100, ge=1, le=settings.MAX_PAGE_SIZE),
+    after_id: Optional[int] = None,
+    current_user: User = Depends(_no_cashiers),
 ) -> Any:
     """
     Retrieve products with stock below reorder level.
     """
-    if current_user.role == UserRole.CASHIER:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions",
-        )
-
-    products = await Product.get_low_stock_products(db, skip=skip, limit=limit)
-    return products
+    products = await Product.get_low_stock_products(
+        db, skip=skip, limit=limit, after_id=after_id
+    )
+    return page_response(_PRODUCT_LIST, products, limit)
 
 
 @router.get("/products/{product_id}", response_model=ProductResponse)
@@ -109,28 +138,23 @@ async def update_product(
     db: AsyncSession = Depends(get_db),
     product_id: int,
     product_in: ProductUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(_no_cashiers),
 ) -> Any:
     """
     Update a product.
     """
-    if current_user.role == UserRole.CASHIER:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions",
-        )
+    product_data = product_in.model_dump(exclude_unset=True)
+    if product_data:
+        product = await Product.update_by_id(db, product_id, product_data)
+    else:
+        product = await Product.get_by_id(db, id=product_id)
 
-    product = await Product.get_by_id(db, id=product_id)
     if not product:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Product not found",
         )
 
-    product_data = product_in.model_dump(exclude_unset=True)
-    if product_data:
-        product = await product.update(db, product_data)
-
     return product
 
 
@@ -139,25 +163,18 @@ async def delete_product(
     *,
     db: AsyncSession = Depends(get_db),
     product_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(_require_staff),
 ) -> Any:
     """
     Delete a product.
     """
-    if current_user.role not in [UserRole.ADMIN, UserRole.MANAGER]:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions",
-        )
-
-    product = await Product.get_by_id(db, id=product_id)
+    product = await Product.delete_by_id(db, product_id)
     if not product:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Product not found",
         )
 
-    await product.delete(db)
     return product
 
 
@@ -165,7 +182,6 @@ async def delete_product(
 async def update_product_stock(
     *,
     db: AsyncSession = Depends(get_db),
-    background_tasks: BackgroundTasks,
     product_id: int,
     stock_update: StockUpdate,
     current_user: User = Depends(get_current_user),
@@ -173,32 +189,23 @@ async def update_product_stock(
     """
     Update product stock.
     """
-    product = await Product.get_by_id(db, id=product_id)
+    # Update stock; refused when it would result in negative stock
+    product = await Product.adjust_stock(db, product_id, stock_update.quantity)
     if not product:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Product not found",
-        )
-
-    # Check if this would result in negative stock
-    if product.quantity + stock_update.quantity < 0:
+        if not await Product.get_stock_fields(db, id=product_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Product not found",
+            )
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot reduce stock below zero",
         )
 
-    # Update stock
-    product = await product.update_stock(db, stock_update.quantity)
-
     # Check if stock is low and send notification if needed
     if product.quantity <= product.reorder_level:
-        # In a real app, you would get this from a settings table or similar
-        manager_emails = ["manager@example.com"]
-
-        # Send low stock notification as a background task
-        send_low_stock_notifications(
-            background_tasks,
-            emails=manager_emails,
+        schedule_low_stock_notifications(
+            _MANAGER_EMAILS,
             product_name=product.name,
             current_stock=product.quantity,
         )
@@ -211,14 +218,18 @@ async def update_product_stock(
 async def read_suppliers(
     db: AsyncSession = Depends(get_db),
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=settings.MAX_PAGE_SIZE),
+    after_id: Optional[int] = None,
     current_user: User = Depends(get_current_user),
 ) -> Any:
     """
     Retrieve suppliers.
+
+    Pass the X-Next-After-Id header of the previous page as after_id
+    for keyset pagination.
     """
-    suppliers = await Supplier.get_all(db, skip=skip, limit=limit)
-    return suppliers
+    suppliers = await Supplier.get_all(db, skip=skip, limit=limit, after_id=after_id)
+    return page_response(_SUPPLIER_LIST, suppliers, limit)
 
 
 @router.post("/suppliers", response_model=SupplierResponse)
@@ -226,17 +237,11 @@ async def create_supplier(
     *,
     db: AsyncSession = Depends(get_db),
     supplier_in: SupplierCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(_no_cashiers),
 ) -> Any:
     """
     Create new supplier.
     """
-    if current_user.role == UserRole.CASHIER:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions",
-        )
-
     supplier = await Supplier.create(db, obj_in=supplier_in.model_dump())
     return supplier
 
@@ -267,28 +272,23 @@ async def update_supplier(
     db: AsyncSession = Depends(get_db),
     supplier_id: int,
     supplier_in: SupplierUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(_no_cashiers),
 ) -> Any:
     """
     Update a supplier.
     """
-    if current_user.role == UserRole.CASHIER:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions",
-        )
+    supplier_data = supplier_in.model_dump(exclude_unset=True)
+    if supplier_data:
+        supplier = await Supplier.update_by_id(db, supplier_id, supplier_data)
+    else:
+        supplier = await Supplier.get_by_id(db, id=supplier_id)
 
-    supplier = await Supplier.get_by_id(db, id=supplier_id)
     if not supplier:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Supplier not found",
         )
 
-    supplier_data = supplier_in.model_dump(exclude_unset=True)
-    if supplier_data:
-        supplier = await supplier.update(db, supplier_data)
-
     return supplier
 
 
@@ -297,23 +297,16 @@ async def delete_supplier(
     *,
     db: AsyncSession = Depends(get_db),
     supplier_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(_require_staff),
 ) -> Any:
     """
     Delete a supplier.
     """
-    if current_user.role not in [UserRole.ADMIN, UserRole.MANAGER]:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions",
-        )
-
-    supplier = await Supplier.get_by_id(db, id=supplier_id)
+    supplier = await Supplier.delete_by_id(db, supplier_id)
     if not supplier:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Supplier not found",
         )
 
-    await supplier.delete(db)
     return supplier
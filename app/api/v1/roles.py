@@ -1,6 +1,7 @@
 from typing import Any, Dict, List
 
 from fastapi import APIRouter, Depends
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
@@ -53,9 +54,11 @@ async def create_custom_role(
     """
     Create a new custom role.
     """
-    return await role_service.create_custom_role(
+    role = await role_service.create_custom_role(
         role_data.role_name, role_data.permissions
     )
+    # Serialize straight to JSON, skipping response_model re-validation
+    return ORJSONResponse(role.model_dump())
 
 
 @router.put("/custom/{role_name}", response_model=RoleResponse)
@@ -68,7 +71,9 @@ async def update_custom_role(
     """
     Update a custom role's permissions.
     """
-    return await role_service.update_custom_role(role_name, role_data.permissions)
+    role = await role_service.update_custom_role(role_name, role_data.permissions)
+    # Serialize straight to JSON, skipping response_model re-validation
+    return ORJSONResponse(role.model_dump())
 
 
 @router.delete("/custom/{role_name}", response_model=RoleResponse)
@@ -81,4 +86,6 @@ async def delete_custom_role(
     """
     Delete a custom role.
     """
-    return await role_service.delete_custom_role(role_name, db)
+    role = await role_service.delete_custom_role(role_name, db)
+    # Serialize straight to JSON, skipping response_model re-validation
+    return ORJSONResponse(role.model_dump())
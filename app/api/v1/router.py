@@ -4,9 +4,15 @@ from app.api.v1 import auth, inventory, roles, sales, users
 
 api_router = APIRouter()
 
+# (router, prefix, tag) for every API module
+ROUTES = (
+    (auth.router, "/auth", "authentication"),
+    (users.router, "/users", "users"),
+    (roles.router, "/roles", "roles"),
+    (inventory.router, "/inventory", "inventory"),
+    (sales.router, "/sales", "sales"),
+)
+
 # Include all API routers
-api_router.include_router(auth.router, prefix="/auth", tags=["authentication"])
-api_router.include_router(users.router, prefix="/users", tags=["users"])
-api_router.include_router(roles.router, prefix="/roles", tags=["roles"])
-api_router.include_router(inventory.router, prefix="/inventory", tags=["inventory"])
-api_router.include_router(sales.router, prefix="/sales", tags=["sales"])
+for module_router, prefix, tag in ROUTES:
+    api_router.include_router(module_router, prefix=prefix, tags=[tag])
@@ -1,12 +1,16 @@
+import base64
+import binascii
 from datetime import timedelta
-from typing import Any, List
+from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
+from app.core.permissions import exclude_roles
 from app.core.security import get_current_user
+from app.core.settings import get_settings
 from app.models.inventory import Product
 from app.models.sales import Order, OrderItem, OrderStatus
 from app.models.user import User, UserRole
@@ -20,22 +24,39 @@ from app.schemas.sales import (
 )
 from app.utils.datetime_utils import ensure_naive_for_db, now_utc
 
+settings = get_settings()
 router = APIRouter()
 
+# Shared by the refund and reporting routes
+_no_cashiers = exclude_roles(UserRole.CASHIER)
 
-async def get_order_with_items(db: AsyncSession, order: Order) -> OrderResponse:
-    """
-    Helper function to get order items and create an OrderResponse.
-    This avoids lazy loading issues during response serialization.
+
+def encode_cursor(order_id: int) -> str:
+    """Encode an order ID as an opaque pagination cursor."""
+    return base64.urlsafe_b64encode(str(order_id).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> int:
+    """Decode a pagination cursor back into an order ID."""
+    try:
+        return int(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
+def build_order_response(order: Order, items: List[OrderItem]) -> OrderResponse:
     """
-    # Explicitly load order items
-    query = select(OrderItem).where(OrderItem.order_id == order.id)
-    result = await db.execute(query)
-    items = result.scalars().all()
+    Create an OrderResponse from an order and its already loaded items.
 
+    The values come straight from the database models, so validation is
+    skipped with model_construct.
+    """
     # Create OrderItemResponse objects
     item_responses = [
-        OrderItemResponse(
+        OrderItemResponse.model_construct(
             id=item.id,
             order_id=item.order_id,
             product_id=item.product_id,
@@ -46,7 +67,7 @@ async def get_order_with_items(db: AsyncSession, order: Order) -> OrderResponse:
     ]
 
     # Create OrderResponse
-    return OrderResponse(
+    return OrderResponse.model_construct(
         id=order.id,
         customer_name=order.customer_name,
         total_amount=order.total_amount,
@@ -58,6 +79,34 @@ async def get_order_with_items(db: AsyncSession, order: Order) -> OrderResponse:
     )
 
 
+def serialize_order(order: Order, items: List[OrderItem]) -> Dict[str, Any]:
+    """
+    Build the OrderResponse body for an order as plain data.
+
+    Used by listings, which hand the result straight to orjson; no Pydantic
+    objects are created per order or item.
+    """
+    return {
+        "customer_name": order.customer_name,
+        "payment_method": order.payment_method,
+        "cashier_id": order.cashier_id,
+        "id": order.id,
+        "total_amount": order.total_amount,
+        "status": order.status,
+        "created_at": order.created_at,
+        "items": [
+            {
+                "product_id": item.product_id,
+                "quantity": item.quantity,
+                "unit_price": item.unit_price,
+                "id": item.id,
+                "order_id": item.order_id,
+            }
+            for item in items
+        ],
+    }
+
+
 @router.post("/orders", response_model=OrderResponse)
 async def create_order(
     *,
@@ -68,17 +117,15 @@ async def create_order(
     """
     Create a new order.
     """
-    # Create order
-    order_data = order_in.model_dump(exclude={"items"})
-    order_data["cashier_id"] = current_user.id
-    order = await Order.create(db, obj_in=order_data)
+    # Load every product on the order in a single query
+    products = await Product.get_by_ids(
+        db, (item_data.product_id for item_data in order_in.items)
+    )
 
-    # Create order items
+    # Validate all items before anything is written
     for item_data in order_in.items:
-        # Get product
-        product = await Product.get_by_id(db, id=item_data.product_id)
+        product = products.get(item_data.product_id)
         if not product:
-            await order.delete(db)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Product with ID {item_data.product_id} not found",
@@ -86,53 +133,62 @@ async def create_order(
 
         # Check stock
         if product.quantity < item_data.quantity:
-            await order.delete(db)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Insufficient stock for product {product.name}",
             )
 
-        # Use product price if not provided
-        unit_price = item_data.unit_price or product.price
-
-        # Create order item
-        item = OrderItem(
-            order_id=order.id,
-            product_id=product.id,
+    # Build the order items, using the product price if none was given
+    items = [
+        OrderItem(
+            product_id=item_data.product_id,
             quantity=item_data.quantity,
-            unit_price=unit_price,
+            unit_price=item_data.unit_price or products[item_data.product_id].price,
         )
-        db.add(item)
+        for item_data in order_in.items
+    ]
 
+    # Insert the order and its items in one transaction, with the total
+    # computed from the prices already at hand
+    order = Order(
+        customer_name=order_in.customer_name,
+        payment_method=order_in.payment_method,
+        cashier_id=current_user.id,
+        total_amount=sum(item.quantity * item.unit_price for item in items),
+    )
+    order.items = items
+    db.add(order)
     await db.commit()
-    await db.refresh(order)
-
-    # Calculate total
-    await order.calculate_total(db)
 
-    # Return order response with items
-    return await get_order_with_items(db, order)
+    return build_order_response(order, items)
 
 
 @router.get("/orders", response_model=List[OrderResponse])
 async def read_orders(
     db: AsyncSession = Depends(get_db),
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=settings.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_user),
 ) -> Any:
     """
-    Retrieve orders.
+    Retrieve orders, newest first.
+
+    When the page is full, the X-Next-Cursor header holds the cursor for the
+    next page.
     """
-    orders = await Order.get_all(db, skip=skip, limit=limit)
+    before_id = decode_cursor(cursor) if cursor else None
 
-    # Convert each order to OrderResponse with items
-    order_responses = []
-    for order in orders:
-        order_response = await get_order_with_items(db, order)
-        order_responses.append(order_response)
+    # Items are eager-loaded with the orders, so no per-order queries are needed
+    orders = await Order.get_all(
+        db, skip=skip, limit=limit, before_id=before_id, with_items=True
+    )
 
-    return order_responses
+    # Serialize straight to JSON, skipping response_model re-validation
+    response = ORJSONResponse([serialize_order(order, order.items) for order in orders])
+    if orders and len(orders) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(orders[-1].id)
+    return response
 
 
 @router.get("/orders/{order_id}", response_model=OrderResponse)
@@ -152,8 +208,8 @@ async def read_order(
             detail="Order not found",
         )
 
-    # Return order response with items
-    return await get_order_with_items(db, order)
+    # Items were preloaded by get_by_id
+    return build_order_response(order, order.items)
 
 
 @router.put("/orders/{order_id}", response_model=OrderResponse)
@@ -174,12 +230,15 @@ async def update_order(
             detail="Order not found",
         )
 
-    order_data = order_in.model_dump(exclude_unset=True)
+    # Only the fields the client sent, read straight off the model
+    order_data = {
+        field: getattr(order_in, field) for field in order_in.model_fields_set
+    }
     if order_data:
         order = await order.update(db, order_data)
 
-    # Return order response with items
-    return await get_order_with_items(db, order)
+    # Items were preloaded by get_by_id
+    return build_order_response(order, order.items)
 
 
 @router.post("/orders/{order_id}/complete", response_model=OrderResponse)
@@ -205,10 +264,16 @@ async def complete_order(
             detail=f"Order is already {order.status}",
         )
 
-    order = await order.complete(db)
+    try:
+        order = await order.complete(db)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
 
-    # Return order response with items
-    return await get_order_with_items(db, order)
+    # Items were preloaded by get_by_id
+    return build_order_response(order, order.items)
 
 
 @router.post("/orders/{order_id}/cancel", response_model=OrderResponse)
@@ -236,8 +301,8 @@ async def cancel_order(
 
     order = await order.cancel(db)
 
-    # Return order response with items
-    return await get_order_with_items(db, order)
+    # Items were preloaded by get_by_id
+    return build_order_response(order, order.items)
 
 
 @router.post("/orders/{order_id}/refund", response_model=OrderResponse)
@@ -245,17 +310,11 @@ async def refund_order(
     *,
     db: AsyncSession = Depends(get_db),
     order_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(_no_cashiers),
 ) -> Any:
     """
     Refund an order and update inventory.
     """
-    if current_user.role == UserRole.CASHIER:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions",
-        )
-
     order = await Order.get_by_id(db, id=order_id)
     if not order:
         raise HTTPException(
@@ -271,8 +330,8 @@ async def refund_order(
 
     order = await order.refund(db)
 
-    # Return order response with items
-    return await get_order_with_items(db, order)
+    # Items were preloaded by get_by_id
+    return build_order_response(order, order.items)
 
 
 @router.post("/reports/sales", response_model=SalesSummary)
@@ -280,52 +339,33 @@ async def generate_sales_report(
     *,
     db: AsyncSession = Depends(get_db),
     date_range: DateRangeRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(_no_cashiers),
 ) -> Any:
     """
     Generate a sales report for a date range.
     """
-    if current_user.role == UserRole.CASHIER:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions",
-        )
-
     # Convert timezone-aware dates to naive for database compatibility
     start_date_naive = ensure_naive_for_db(date_range.start_date)
     end_date_naive = ensure_naive_for_db(date_range.end_date)
 
-    # Get orders in date range
-    orders = await Order.get_by_date_range(
+    # Sum the items of completed orders in the database
+    total_sales, order_count = await Order.get_sales_totals(
         db,
         start_date=start_date_naive,
         end_date=end_date_naive,
     )
 
-    # Calculate summary - only use completed orders
-    completed_orders = [
-        order for order in orders if order.status == OrderStatus.COMPLETED
-    ]
-
-    # Calculate total sales by summing up the items for each order
-    total_sales = 0.0
-    for order in completed_orders:
-        # Calculate total for this order from its items
-        order_total = 0.0
-        for item in order.items:
-            order_total += item.quantity * item.unit_price
-        total_sales += order_total
-
-    order_count = len(completed_orders)
     average_order_value = total_sales / order_count if order_count > 0 else 0
 
-    return SalesSummary(
+    # All fields are already typed, so skip validation on both ends
+    summary = SalesSummary.model_construct(
         total_sales=total_sales,
         order_count=order_count,
         average_order_value=average_order_value,
         start_date=date_range.start_date,
         end_date=date_range.end_date,
     )
+    return ORJSONResponse(summary.model_dump(mode="json"))
 
 
 @router.get("/reports/daily-sales")
@@ -333,17 +373,11 @@ async def get_daily_sales(
     *,
     db: AsyncSession = Depends(get_db),
     days: int = 7,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(_no_cashiers),
 ) -> Any:
     """
     Get daily sales for the last N days.
     """
-    if current_user.role == UserRole.CASHIER:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions",
-        )
-
     # Calculate date range
     end_date = now_utc()
     start_date = end_date - timedelta(days=days)
@@ -352,36 +386,9 @@ async def get_daily_sales(
     start_date_naive = ensure_naive_for_db(start_date)
     end_date_naive = ensure_naive_for_db(end_date)
 
-    # Get orders in date range
-    orders = await Order.get_by_date_range(
+    # Group completed orders by day in the database
+    return await Order.get_daily_sales_totals(
         db,
         start_date=start_date_naive,
         end_date=end_date_naive,
-        limit=1000,  # Higher limit for reports
     )
-
-    # Filter completed orders first to avoid any potential lazy loading issues
-    completed_orders = [
-        order for order in orders if order.status == OrderStatus.COMPLETED
-    ]
-
-    # Group by day
-    daily_sales = {}
-    for order in completed_orders:
-        day = order.created_at.date().isoformat()
-        if day not in daily_sales:
-            daily_sales[day] = {
-                "date": day,
-                "total_sales": 0,
-                "order_count": 0,
-            }
-
-        # Calculate total for this order from its items
-        order_total = 0.0
-        for item in order.items:
-            order_total += item.quantity * item.unit_price
-
-        daily_sales[day]["total_sales"] += order_total
-        daily_sales[day]["order_count"] += 1
-
-    return list(daily_sales.values())
@@ -1,15 +1,19 @@
+import asyncio
 from typing import Any, List
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
+from app.core.password import get_password_hash
 from app.core.permissions import require_permission
 from app.core.security import get_current_user
+from app.core.settings import get_settings
 from app.models.user import User
 from app.schemas.user import UserCreate, UserResponse, UserUpdate
 from app.services import user_manager
 
+settings = get_settings()
 router = APIRouter()
 
 
@@ -18,7 +22,7 @@ router = APIRouter()
 async def read_users(
     db: AsyncSession = Depends(get_db),
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=settings.MAX_PAGE_SIZE),
     current_user: User = Depends(require_permission("users:read")),
 ) -> Any:
     """
@@ -91,12 +95,14 @@ async def update_user(
             detail="User not found",
         )
 
-    # Handle password separately
+    # Hash a new password into the same update as the other fields
     user_data = user_in.model_dump(exclude_unset=True)
-    if "password" in user_data and user_data["password"]:
-        await user.update_password(db, user_data.pop("password"))
+    password = user_data.pop("password", None)
+    if password:
+        user_data["hashed_password"] = await asyncio.to_thread(
+            get_password_hash, password
+        )
 
-    # Update other fields
     if user_data:
         user = await user_manager.update(db, user, user_data, user=current_user)
 
@@ -1,11 +1,96 @@
+import atexit
 import logging
+import os
+import queue
+from logging.handlers import QueueListener, RotatingFileHandler
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
+
+from pythonjsonlogger.jsonlogger import JsonFormatter
+from rich.logging import RichHandler
 
 from app.core.settings import get_settings
 
 settings = get_settings()
 
+# Records queued by the "queue" handler and emitted by a listener thread, so
+# request handlers never block on console formatting, disk I/O or log rotation
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_queue_listener: Optional[QueueListener] = None
+
+
+@atexit.register
+def _stop_log_listener() -> None:
+    """Stop the log listener, flushing any queued records to its handlers."""
+    global _queue_listener
+
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        for handler in _queue_listener.handlers:
+            handler.close()
+        _queue_listener = None
+
+
+def _start_log_listener(level: int, filename: Optional[Path] = None) -> None:
+    """
+    Start the background thread that emits queued records.
+
+    Records always go to the console, and also to filename when given.
+    """
+    global _queue_listener
+
+    _stop_log_listener()
+
+    console_handler = RichHandler()
+    console_handler.setLevel(level)
+    console_handler.setFormatter(
+        logging.Formatter(
+            "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+            datefmt="%Y-%m-%d %H:%M:%S",
+        )
+    )
+    handlers: List[logging.Handler] = [console_handler]
+
+    if filename is not None:
+        file_handler = RotatingFileHandler(
+            filename,
+            maxBytes=10485760,  # 10 MB
+            backupCount=5,
+            encoding="utf8",
+        )
+        file_handler.setLevel(level)
+        file_handler.setFormatter(
+            JsonFormatter("%(asctime)s %(name)s %(levelname)s %(message)s")
+        )
+        handlers.append(file_handler)
+
+    _queue_listener = QueueListener(_log_queue, *handlers, respect_handler_level=True)
+    _queue_listener.start()
+
+
+def _restart_log_listener_after_fork() -> None:
+    """
+    Start a fresh listener in a forked child, such as a gunicorn worker of a
+    preloaded app. The parent's listener thread does not survive the fork, so
+    without this the child's records would pile up in its copy of the queue.
+    """
+    global _queue_listener
+
+    if _queue_listener is None:
+        return
+
+    # Records the parent had not emitted yet are the parent's to write
+    while not _log_queue.empty():
+        _log_queue.get_nowait()
+
+    _queue_listener = QueueListener(
+        _log_queue, *_queue_listener.handlers, respect_handler_level=True
+    )
+    _queue_listener.start()
+
+
+os.register_at_fork(after_in_child=_restart_log_listener_after_fork)
+
 
 def setup_logging() -> None:
     """Configure application logging."""
@@ -24,70 +109,37 @@ def setup_logging() -> None:
         file_logging_available = False
         print("Warning: Cannot write to logs directory. File logging disabled.")
 
+    # Every logger hands records to the queue; the listener thread owns the
+    # console and file handlers
     logging_config: Dict[str, Any] = {
         "version": 1,
         "disable_existing_loggers": False,
-        "formatters": {
-            "default": {
-                "format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-                "datefmt": "%Y-%m-%d %H:%M:%S",
-            },
-            "json": {
-                "()": "pythonjsonlogger.jsonlogger.JsonFormatter",
-                "format": "%(asctime)s %(name)s %(levelname)s %(message)s",
-            },
-        },
         "handlers": {
-            "console": {
-                "level": log_level,
-                "class": "rich.logging.RichHandler",
-                "formatter": "default",
-            },
-            "file": {
+            "queue": {
                 "level": log_level,
-                "class": "logging.handlers.RotatingFileHandler",
-                "formatter": "json",
-                "filename": logs_dir / "isms.log",
-                "maxBytes": 10485760,  # 10 MB
-                "backupCount": 5,
-                "encoding": "utf8",
+                "()": "logging.handlers.QueueHandler",
+                "queue": "ext://app.core.logging._log_queue",
             },
         },
         "loggers": {
             "app": {
-                "handlers": (
-                    ["console"]
-                    if settings.ENV_MODE == "development" or not file_logging_available
-                    else ["console", "file"]
-                ),
+                "handlers": ["queue"],
                 "level": log_level,
                 "propagate": False,
             },
             "uvicorn": {
-                "handlers": (
-                    ["console"]
-                    if settings.ENV_MODE == "development" or not file_logging_available
-                    else ["console", "file"]
-                ),
+                "handlers": ["queue"],
                 "level": log_level,
                 "propagate": False,
             },
             "sqlalchemy.engine": {
-                "handlers": (
-                    ["console"]
-                    if settings.ENV_MODE == "development" or not file_logging_available
-                    else ["console", "file"]
-                ),
+                "handlers": ["queue"],
                 "level": logging.WARNING,
                 "propagate": False,
             },
         },
         "root": {
-            "handlers": (
-                ["console"]
-                if settings.ENV_MODE == "development" or not file_logging_available
-                else ["console", "file"]
-            ),
+            "handlers": ["queue"],
             "level": log_level,
         },
     }
@@ -96,8 +148,17 @@ def setup_logging() -> None:
     from logging.config import dictConfig
 
     try:
+        _start_log_listener(
+            log_level,
+            (
+                logs_dir / "isms.log"
+                if settings.ENV_MODE != "development" and file_logging_available
+                else None
+            ),
+        )
         dictConfig(logging_config)
     except Exception as e:
+        _stop_log_listener()
         # Fallback to basic console logging if configuration fails
         logging.basicConfig(
             level=log_level,
@@ -111,5 +172,8 @@ def setup_logging() -> None:
     # Log startup message
     logger = logging.getLogger("app")
     logger.info(
-        f"Starting {settings.PROJECT_NAME} v{settings.VERSION} in {settings.ENV_MODE} mode"
+        "Starting %s v%s in %s mode",
+        settings.PROJECT_NAME,
+        settings.VERSION,
+        settings.ENV_MODE,
     )
@@ -1,5 +1,7 @@
+import sys
 from enum import Enum
-from typing import Dict, List, Set
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Set, Tuple
 
 from fastapi import Depends, HTTPException, status
 
@@ -42,21 +44,42 @@ class PermissionType(str, Enum):
     EXPORT_REPORTS = "reports:export"
 
 
+# Shared result for roles without any permissions
+_NO_PERMISSIONS: FrozenSet[str] = frozenset()
+
+
 class PermissionRegistry:
-    """Registry for managing role-based permissions."""
+    """
+    Registry for managing role-based permissions.
+
+    Permission sets are stored as frozensets and replaced, never mutated, so
+    they can be handed out to callers directly.
+    """
 
     # Standard role permissions
-    _standard_permissions: Dict[UserRole, Set[str]] = {
-        UserRole.ADMIN: set(),  # Admins have all permissions by default
-        UserRole.MANAGER: set(),
-        UserRole.CASHIER: set(),
+    _standard_permissions: Dict[UserRole, FrozenSet[str]] = {
+        UserRole.ADMIN: frozenset(),  # Admins have all permissions by default
+        UserRole.MANAGER: frozenset(),
+        UserRole.CASHIER: frozenset(),
     }
 
     # Custom role permissions
-    _custom_permissions: Dict[str, Set[str]] = {}
+    _custom_permissions: Dict[str, FrozenSet[str]] = {}
 
     # All available permissions
-    _all_permissions: Set[str] = set()
+    _all_permissions: FrozenSet[str] = frozenset()
+
+    # Bumped on every change so callers can cache derived views
+    version: int = 0
+
+    # Memoized has_permission results by (role, permission)
+    _permission_cache: Dict[Tuple[str, str], bool] = {}
+
+    @classmethod
+    def _changed(cls) -> None:
+        """Record a registry change and drop memoized lookups."""
+        cls.version += 1
+        cls._permission_cache.clear()
 
     @classmethod
     def register_permission(cls, permission: str, roles: List[UserRole] = None) -> None:
@@ -67,17 +90,24 @@ class PermissionRegistry:
             permission: Permission name
             roles: Roles to assign the permission to (None means admin only)
         """
+        # Interned so lookups with the services' interned constants match by
+        # identity before comparing characters
+        permission = sys.intern(permission)
+
         # Add to all permissions
-        cls._all_permissions.add(permission)
+        cls._all_permissions = cls._all_permissions | {permission}
 
         # Always give admins all permissions
-        cls._standard_permissions[UserRole.ADMIN].add(permission)
+        standard = cls._standard_permissions
+        standard[UserRole.ADMIN] = standard[UserRole.ADMIN] | {permission}
 
         # Assign to other roles if specified
         if roles:
             for role in roles:
                 if role != UserRole.ADMIN:  # Admin already has all permissions
-                    cls._standard_permissions[role].add(permission)
+                    standard[role] = standard[role] | {permission}
+
+        cls._changed()
 
     @classmethod
     def register_custom_role(cls, role_name: str, permissions: Set[str]) -> None:
@@ -93,10 +123,22 @@ class PermissionRegistry:
             if permission not in cls._all_permissions:
                 raise ValueError(f"Unknown permission: {permission}")
 
-        cls._custom_permissions[role_name] = permissions
+        cls._custom_permissions[role_name] = frozenset(map(sys.intern, permissions))
+        cls._changed()
 
     @classmethod
-    def get_role_permissions(cls, role: str) -> Set[str]:
+    def remove_custom_role(cls, role_name: str) -> None:
+        """
+        Remove a custom role.
+
+        Args:
+            role_name: Name of the custom role
+        """
+        cls._custom_permissions.pop(role_name, None)
+        cls._changed()
+
+    @classmethod
+    def get_role_permissions(cls, role: str) -> FrozenSet[str]:
         """
         Get the permissions for a role.
 
@@ -106,13 +148,13 @@ class PermissionRegistry:
         Returns:
             Set of permissions for the role
         """
-        # Check if it's a standard role
-        try:
-            standard_role = UserRole(role)
-            return cls._standard_permissions.get(standard_role, set())
-        except ValueError:
+        # UserRole members hash like their values, so plain strings match
+        # the standard role keys directly
+        permissions = cls._standard_permissions.get(role)
+        if permissions is None:
             # It's a custom role
-            return cls._custom_permissions.get(role, set())
+            permissions = cls._custom_permissions.get(role, _NO_PERMISSIONS)
+        return permissions
 
     @classmethod
     def has_permission(cls, user: User, permission: str) -> bool:
@@ -130,14 +172,15 @@ class PermissionRegistry:
         if user.is_superuser:
             return True
 
-        # Get permissions for the user's role
-        role_permissions = cls.get_role_permissions(user.role)
-
-        # Check if the user has the permission
-        return permission in role_permissions
+        key = (user.role, permission)
+        allowed = cls._permission_cache.get(key)
+        if allowed is None:
+            allowed = permission in cls.get_role_permissions(user.role)
+            cls._permission_cache[key] = allowed
+        return allowed
 
     @classmethod
-    def get_all_permissions(cls) -> Set[str]:
+    def get_all_permissions(cls) -> FrozenSet[str]:
         """
         Get all registered permissions.
 
@@ -147,7 +190,7 @@ class PermissionRegistry:
         return cls._all_permissions
 
     @classmethod
-    def get_all_roles(cls) -> Dict[str, Set[str]]:
+    def get_all_roles(cls) -> Dict[str, FrozenSet[str]]:
         """
         Get all roles with their permissions.
 
@@ -158,7 +201,7 @@ class PermissionRegistry:
 
         # Add standard roles
         for role in UserRole:
-            result[role.value] = cls._standard_permissions.get(role, set())
+            result[role.value] = cls._standard_permissions.get(role, _NO_PERMISSIONS)
 
         # Add custom roles
         for role, permissions in cls._custom_permissions.items():
@@ -168,22 +211,29 @@ class PermissionRegistry:
 
 
 # Define permission dependency
+@lru_cache(maxsize=None)
 def require_permission(permission: str):
     """
     Dependency for requiring a specific permission.
 
+    The same dependency is returned for repeated calls with one permission,
+    so FastAPI evaluates it at most once per request.
+
     Args:
         permission: Required permission
 
     Returns:
         Dependency function
     """
+    has_permission = PermissionRegistry.has_permission
 
     async def _require_permission(
         current_user: User = Depends(get_current_user),
     ) -> User:
         """Check if the current user has the required permission."""
-        if not PermissionRegistry.has_permission(current_user, permission):
+        if not current_user.is_superuser and not has_permission(
+            current_user, permission
+        ):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Not enough permissions",
@@ -193,6 +243,60 @@ def require_permission(permission: str):
     return _require_permission
 
 
+def require_roles(*roles: UserRole):
+    """
+    Dependency for requiring one of the given standard roles.
+
+    Args:
+        roles: Roles allowed to access the endpoint
+
+    Returns:
+        Dependency function
+    """
+    allowed = frozenset(role.value for role in roles)
+
+    async def _require_roles(
+        current_user: User = Depends(get_current_user),
+    ) -> User:
+        """Check if the current user has one of the required roles."""
+        if current_user.role not in allowed:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not enough permissions",
+            )
+        return current_user
+
+    return _require_roles
+
+
+def exclude_roles(*roles: UserRole):
+    """
+    Dependency for rejecting users with any of the given standard roles.
+
+    Unlike require_roles, custom roles are let through.
+
+    Args:
+        roles: Roles denied access to the endpoint
+
+    Returns:
+        Dependency function
+    """
+    denied = frozenset(role.value for role in roles)
+
+    async def _exclude_roles(
+        current_user: User = Depends(get_current_user),
+    ) -> User:
+        """Check that the current user has none of the excluded roles."""
+        if current_user.role in denied:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not enough permissions",
+            )
+        return current_user
+
+    return _exclude_roles
+
+
 # Register common permissions
 def register_common_permissions():
     """Register common permissions for the application."""
@@ -1,15 +1,20 @@
 from typing import Any, Dict, Generic, List, Optional, Type, TypeVar
 
-from sqlalchemy import select
+from fastapi import HTTPException, status
+from sqlalchemy import false, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import Select
 
+from app.core.permissions import PermissionRegistry
 from app.models.base import BaseModel
 from app.models.user import User
 
 # Type variable for the model
 T = TypeVar("T", bound=BaseModel)
 
+# WHERE clause matching no rows, built once for filter_for_user deny paths
+NO_ROWS = false()
+
 
 class QueryManager(Generic[T]):
     """
@@ -83,7 +88,6 @@ class QueryManager(Generic[T]):
         obj = self.model(**obj_in)
         db.add(obj)
         await db.commit()
-        await db.refresh(obj)
         return obj
 
     async def update(
@@ -112,7 +116,6 @@ class QueryManager(Generic[T]):
 
         db.add(db_obj)
         await db.commit()
-        await db.refresh(db_obj)
         return db_obj
 
     async def delete(
@@ -150,6 +153,16 @@ class QueryManager(Generic[T]):
         # By default, no filtering
         return query
 
+    @staticmethod
+    def _require(user: Optional[User], permission: str, detail: str) -> None:
+        """
+        Raise a 403 with detail unless user is set and has permission.
+
+        Shared by the check_*_permission overrides in the query managers.
+        """
+        if not user or not PermissionRegistry.has_permission(user, permission):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
+
     def check_create_permission(self, user: Optional[User] = None) -> None:
         """
         Check if user has permission to create records.
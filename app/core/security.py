@@ -1,20 +1,85 @@
-from datetime import datetime, timedelta, timezone
-from typing import Any, Optional, Union
+import hashlib
+import time
+from datetime import timedelta
+from typing import Any, Dict, Optional, Tuple, Union
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
+from jose import JWTError, jwk, jwt
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.core.settings import get_settings
-from app.schemas.token import TokenPayload
+from app.models.user import User
 
 settings = get_settings()
 
 # OAuth2 scheme for token authentication
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
+# HMAC key built once; passing a plain string makes jose re-parse and
+# re-construct the key on every encode and decode
+_JWT_ALGORITHM = "HS256"
+_JWT_ALGORITHMS = (_JWT_ALGORITHM,)
+_JWT_KEY = jwk.construct(settings.SECRET_KEY, _JWT_ALGORITHM)
+
+# Default token lifetime in seconds
+_ACCESS_TOKEN_LIFETIME = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
+# Verified tokens, keyed by SHA-256 of the raw token: (cached_until, exp, sub).
+# Only successful decodes are stored; invalid tokens are re-checked every time.
+_TOKEN_CACHE: Dict[str, Tuple[float, float, str]] = {}
+TOKEN_CACHE_TTL = 60  # seconds
+TOKEN_CACHE_MAX_SIZE = 10_000
+
+
+def _credentials_exception() -> HTTPException:
+    """Build the 401 raised when a token cannot be validated."""
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def _decode_token(token: str) -> Tuple[float, str]:
+    """
+    Verify a JWT and return its (exp, sub) claims.
+
+    Repeat presentations of the same token within TOKEN_CACHE_TTL skip the
+    signature check and JSON parsing.
+
+    Raises:
+        HTTPException: If the token is invalid or expired
+    """
+    key = hashlib.sha256(token.encode()).hexdigest()
+    now = time.time()
+
+    cached = _TOKEN_CACHE.get(key)
+    if cached is not None:
+        cached_until, exp, sub = cached
+        if now < cached_until:
+            if exp < now:
+                raise _credentials_exception()
+            return exp, sub
+        del _TOKEN_CACHE[key]
+
+    try:
+        payload = jwt.decode(token, _JWT_KEY, algorithms=_JWT_ALGORITHMS)
+    except JWTError:
+        raise _credentials_exception()
+
+    # The signature is verified, so read the two claims we need directly
+    exp = payload.get("exp")
+    sub = payload.get("sub")
+    if exp is None or sub is None or exp < now:
+        raise _credentials_exception()
+
+    if len(_TOKEN_CACHE) >= TOKEN_CACHE_MAX_SIZE:
+        _TOKEN_CACHE.clear()
+    _TOKEN_CACHE[key] = (now + TOKEN_CACHE_TTL, exp, sub)
+    return exp, sub
+
 
 def create_access_token(
     subject: Union[str, Any], expires_delta: Optional[timedelta] = None
@@ -30,14 +95,14 @@ def create_access_token(
         str: Encoded JWT token
     """
     if expires_delta:
-        expire = datetime.now(timezone.utc) + expires_delta
+        lifetime = expires_delta.total_seconds()
     else:
-        expire = datetime.now(timezone.utc) + timedelta(
-            minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
-        )
+        lifetime = _ACCESS_TOKEN_LIFETIME
 
+    # exp is a NumericDate; build it from the epoch clock directly
+    expire = int(time.time() + lifetime)
     to_encode = {"exp": expire, "sub": str(subject)}
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm="HS256")
+    encoded_jwt = jwt.encode(to_encode, _JWT_KEY, algorithm=_JWT_ALGORITHM)
     return encoded_jwt
 
 
@@ -47,6 +112,10 @@ async def get_current_user(
     """
     Get the current authenticated user.
 
+    FastAPI caches this dependency per request, so the token is decoded and
+    the user loaded once even when several dependencies of a route need it.
+    Across requests the user row comes from User.get_cached.
+
     Args:
         db: Database session
         token: JWT token
@@ -57,29 +126,12 @@ async def get_current_user(
     Raises:
         HTTPException: If authentication fails
     """
-    # Import User here to avoid circular imports
-    from app.models.user import User
-
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
-        token_data = TokenPayload(**payload)
-
-        if token_data.exp < datetime.now(timezone.utc).timestamp():
-            raise credentials_exception
-
-    except JWTError:
-        raise credentials_exception
+    _, sub = _decode_token(token)
 
-    user = await User.get_by_id(db, int(token_data.sub))
+    user = await User.get_cached(db, int(sub))
 
     if not user:
-        raise credentials_exception
+        raise _credentials_exception()
 
     if not user.is_active:
         raise HTTPException(
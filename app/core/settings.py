@@ -65,6 +65,11 @@ class Settings(BaseSettings):
     MAX_CONNECTIONS: int = 100
     POOL_SIZE: int = 20
     MAX_OVERFLOW: int = 30
+    POOL_TIMEOUT: int = 30  # Seconds to wait for a pooled connection
+    POOL_PRE_PING: bool = False  # Check connections with SELECT 1 on checkout
+    QUERY_CACHE_SIZE: int = 1200  # Compiled SQL statements kept per engine
+    MAX_PAGE_SIZE: int = 500  # Largest limit accepted by list endpoints
+    STATEMENT_TIMEOUT_MS: int = 30000  # PostgreSQL statement_timeout, 0 disables
 
     # Security settings
     SECURE_HEADERS: bool = False
@@ -74,10 +79,15 @@ class Settings(BaseSettings):
     RATE_LIMIT_ENABLED: bool = False
     RATE_LIMIT_REQUESTS: int = 100
     RATE_LIMIT_WINDOW: int = 60
+    RATE_LIMIT_REDIS_URL: Optional[str] = None  # Share limits across workers
 
     # Monitoring
     HEALTH_CHECK_ENABLED: bool = True
     METRICS_ENABLED: bool = False
+    HEALTH_SAMPLE_INTERVAL: int = 15  # Seconds between system metric samples
+
+    # Notifications
+    MANAGER_EMAILS: list[str] = ["manager@example.com"]
 
     model_config = ConfigDict(
         env_file=".env",
@@ -1,12 +1,14 @@
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.api.v1 import health
 from app.api.v1.router import api_router
-from app.core.database import create_db_and_tables
+from app.core.database import create_db_and_tables, warm_up_pool
 from app.core.logging import setup_logging
 from app.core.settings import get_settings
 from app.utils.middleware import RequestLoggingMiddleware
@@ -35,11 +37,16 @@ async def lifespan(_app: FastAPI):  # noqa: ARG001
     logger.info("Starting application")
     await create_db_and_tables()
     logger.info("Database tables created")
+    await warm_up_pool()
+
+    # Sample system metrics in the background for health/metrics endpoints
+    sampler = asyncio.create_task(health._refresh_system_metrics())
 
     yield
 
     # Shutdown
     logger.info("Shutting down application")
+    sampler.cancel()
 
 
 # Create FastAPI application
@@ -48,6 +55,7 @@ app = FastAPI(
     description=settings.DESCRIPTION,
     version=settings.VERSION,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Add security middleware (order matters - add before CORS!)
@@ -60,16 +68,17 @@ if settings.ENV_MODE == "production":
         RateLimitMiddleware,
         requests_per_minute=settings.RATE_LIMIT_REQUESTS,
         window_size=settings.RATE_LIMIT_WINDOW,
+        redis_url=settings.RATE_LIMIT_REDIS_URL,
     )
 
     # Compression
-    app.add_middleware(CompressionMiddleware)
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
 
 # Set up CORS middleware
 if settings.BACKEND_CORS_ORIGINS:
     app.add_middleware(
         CORSMiddleware,
-        allow_origins=[str(origin) for origin in settings.BACKEND_CORS_ORIGINS],
+        allow_origins=settings.BACKEND_CORS_ORIGINS,
         allow_credentials=True,
         allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"],
         allow_headers=["*"],
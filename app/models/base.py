@@ -1,12 +1,27 @@
 from datetime import datetime
-from typing import Any, ClassVar, Dict, List, Optional, Type, TypeVar
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Executable
 from sqlmodel import Field, SQLModel
 
 T = TypeVar("T", bound="BaseModel")
 
+# Parameterized statements built once per (model, name) by BaseModel._statement
+_STATEMENTS: Dict[Tuple[type, str], Executable] = {}
+
 
 class BaseModel(SQLModel):
     """Base model with common fields and methods."""
@@ -18,19 +33,55 @@ class BaseModel(SQLModel):
     # Class variables
     __tablename__: ClassVar[str]
 
+    @classmethod
+    def _statement(cls, name: str, build: Callable[[], Executable]) -> Executable:
+        """
+        Return the statement registered as name for this model, building it
+        on first use. Statements take their values as bind parameters, so
+        the same object (and its compiled SQL cache entry) is reused.
+        """
+        key = (cls, name)
+        stmt = _STATEMENTS.get(key)
+        if stmt is None:
+            stmt = _STATEMENTS[key] = build()
+        return stmt
+
     @classmethod
     async def get_by_id(cls: Type[T], db: AsyncSession, id: int) -> Optional[T]:
         """Get a record by ID."""
-        query = select(cls).where(cls.id == id)
-        result = await db.execute(query)
+        query = cls._statement(
+            "get_by_id", lambda: select(cls).where(cls.id == bindparam("id"))
+        )
+        result = await db.execute(query, {"id": id})
         return result.scalar_one_or_none()
 
+    @classmethod
+    async def get_by_ids(
+        cls: Type[T], db: AsyncSession, ids: Iterable[int]
+    ) -> Dict[int, T]:
+        """Get records for several IDs in one query, keyed by ID."""
+        query = select(cls).where(cls.id.in_(set(ids)))
+        result = await db.execute(query)
+        return {obj.id: obj for obj in result.scalars().all()}
+
     @classmethod
     async def get_all(
-        cls: Type[T], db: AsyncSession, skip: int = 0, limit: int = 100
+        cls: Type[T],
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None,
     ) -> List[T]:
-        """Get all records with pagination."""
-        query = select(cls).offset(skip).limit(limit)
+        """
+        Get all records with pagination.
+
+        Pass after_id (the last ID of the previous page) for keyset
+        pagination; skip is kept for offset-based callers.
+        """
+        query = select(cls).order_by(cls.id)
+        if after_id is not None:
+            query = query.where(cls.id > after_id)
+        query = query.offset(skip).limit(limit)
         result = await db.execute(query)
         return result.scalars().all()
 
@@ -40,7 +91,6 @@ class BaseModel(SQLModel):
         obj = cls(**obj_in)
         db.add(obj)
         await db.commit()
-        await db.refresh(obj)
         return obj
 
     async def update(self: T, db: AsyncSession, obj_in: Dict[str, Any]) -> T:
@@ -50,9 +100,33 @@ class BaseModel(SQLModel):
         self.updated_at = datetime.now()
         db.add(self)
         await db.commit()
-        await db.refresh(self)
         return self
 
+    @classmethod
+    async def update_by_id(
+        cls: Type[T], db: AsyncSession, id: int, obj_in: Dict[str, Any]
+    ) -> Optional[T]:
+        """Update a record by ID in a single UPDATE ... RETURNING round-trip."""
+        query = (
+            update(cls)
+            .where(cls.id == id)
+            .values(**obj_in, updated_at=datetime.now())
+            .returning(cls)
+        )
+        result = await db.execute(query)
+        obj = result.scalar_one_or_none()
+        await db.commit()
+        return obj
+
+    @classmethod
+    async def delete_by_id(cls: Type[T], db: AsyncSession, id: int) -> Optional[T]:
+        """Delete a record by ID in a single DELETE ... RETURNING round-trip."""
+        query = delete(cls).where(cls.id == id).returning(cls)
+        result = await db.execute(query)
+        obj = result.scalar_one_or_none()
+        await db.commit()
+        return obj
+
     async def delete(self: T, db: AsyncSession) -> None:
         """Delete a record."""
         await db.delete(self)
@@ -1,8 +1,10 @@
 from datetime import datetime
 from enum import Enum
-from typing import ClassVar, Optional
+from typing import ClassVar, Dict, Optional, Set, Tuple
 
-from sqlalchemy import Column, String, select
+from sqlalchemy import Column, Index, String, bindparam, case, select, text, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import Field, Relationship
 
@@ -28,6 +30,16 @@ class Product(BaseModel, table=True):
     """Product model for inventory management."""
 
     __tablename__: ClassVar[str] = "products"
+    __table_args__ = (
+        # Partial index over just the low-stock rows, in the ID order
+        # get_low_stock_products pages through
+        Index(
+            "ix_products_low_stock",
+            "id",
+            postgresql_where=text("quantity <= reorder_level"),
+            sqlite_where=text("quantity <= reorder_level"),
+        ),
+    )
 
     name: str = Field(nullable=False)
     description: str = Field(default="")
@@ -45,23 +57,159 @@ class Product(BaseModel, table=True):
     @classmethod
     async def get_by_sku(cls, db: AsyncSession, sku: str) -> Optional["Product"]:
         """Get a product by SKU."""
-        query = select(cls).where(cls.sku == sku)
-        result = await db.execute(query)
+        query = cls._statement(
+            "get_by_sku", lambda: select(cls).where(cls.sku == bindparam("sku"))
+        )
+        result = await db.execute(query, {"sku": sku})
         return result.scalar_one_or_none()
 
+    @classmethod
+    async def create_if_sku_free(
+        cls, db: AsyncSession, obj_in: dict
+    ) -> Optional["Product"]:
+        """
+        Create a product unless its SKU is already taken.
+
+        Uses INSERT ... ON CONFLICT (sku) DO NOTHING RETURNING, so the
+        uniqueness check and the insert happen in a single statement.
+
+        Returns:
+            The new product, or None if the SKU already exists
+        """
+        insert = (
+            postgresql_insert
+            if db.get_bind().dialect.name == "postgresql"
+            else sqlite_insert
+        )
+        values = cls(**obj_in).model_dump(exclude={"id"})
+        query = (
+            insert(cls)
+            .values(**values)
+            .on_conflict_do_nothing(index_elements=[cls.sku])
+            .returning(cls)
+        )
+        result = await db.execute(query)
+        product = result.scalar_one_or_none()
+        await db.commit()
+        return product
+
+    @classmethod
+    async def get_stock_fields(
+        cls, db: AsyncSession, id: int
+    ) -> Optional[Tuple[int, int, str]]:
+        """Get only (quantity, reorder_level, name) for a product by ID."""
+        query = cls._statement(
+            "get_stock_fields",
+            lambda: select(cls.quantity, cls.reorder_level, cls.name).where(
+                cls.id == bindparam("id")
+            ),
+        )
+        result = await db.execute(query, {"id": id})
+        row = result.one_or_none()
+        return tuple(row) if row is not None else None
+
     @classmethod
     async def get_low_stock_products(
-        cls, db: AsyncSession, skip: int = 0, limit: int = 100
+        cls,
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None,
     ) -> list["Product"]:
         """Get products with stock below reorder level."""
+        query = select(cls).where(cls.quantity <= cls.reorder_level).order_by(cls.id)
+        if after_id is not None:
+            query = query.where(cls.id > after_id)
+        query = query.offset(skip).limit(limit)
+        result = await db.execute(query)
+        return result.scalars().all()
+
+    @classmethod
+    async def adjust_stock(
+        cls,
+        db: AsyncSession,
+        id: int,
+        quantity_change: int,
+        is_sale: bool = False,
+        commit: bool = True,
+    ) -> Optional["Product"]:
+        """
+        Update product stock by ID in a single UPDATE ... RETURNING round-trip.
+
+        The change is only applied if it does not take stock below zero.
+
+        Args:
+            db: Database session
+            id: Product ID
+            quantity_change: Amount to change (positive for additions, negative for removals)
+            is_sale: Whether this is a sale transaction
+            commit: Whether to commit, or leave it to the caller's transaction
+
+        Returns:
+            Updated product, or None if the product does not exist or the
+            change would make stock negative
+        """
         query = (
-            select(cls)
-            .where(cls.quantity <= cls.reorder_level)
-            .offset(skip)
-            .limit(limit)
+            update(cls)
+            .where(cls.id == id, cls.quantity + quantity_change >= 0)
+            .values(quantity=cls.quantity + quantity_change, updated_at=datetime.now())
+            .returning(cls)
         )
         result = await db.execute(query)
-        return result.scalars().all()
+        product = result.scalar_one_or_none()
+        if product is None:
+            return None
+
+        db.add(_stock_movement(id, quantity_change, is_sale))
+        if commit:
+            await db.commit()
+        return product
+
+    @classmethod
+    async def adjust_stock_many(
+        cls,
+        db: AsyncSession,
+        changes: Dict[int, int],
+        is_sale: bool = False,
+        commit: bool = True,
+    ) -> Set[int]:
+        """
+        Update the stock of several products in one UPDATE ... RETURNING.
+
+        Each change is only applied if it does not take that product's stock
+        below zero. One stock movement is recorded per updated product.
+
+        Args:
+            db: Database session
+            changes: Quantity change per product ID
+            is_sale: Whether this is a sale transaction
+            commit: Whether to commit, or leave it to the caller's transaction
+
+        Returns:
+            IDs of the updated products; missing products and changes that
+            would make stock negative are left out
+        """
+        if not changes:
+            return set()
+
+        delta = case(changes, value=cls.id, else_=0)
+        query = (
+            update(cls)
+            .where(cls.id.in_(changes), cls.quantity + delta >= 0)
+            .values(quantity=cls.quantity + delta, updated_at=datetime.now())
+            .returning(cls.id)
+        )
+        result = await db.execute(query)
+        updated = set(result.scalars().all())
+
+        db.add_all(
+            _stock_movement(id, change, is_sale)
+            for id, change in changes.items()
+            if id in updated
+        )
+        if commit:
+            await db.commit()
+        return updated
 
     async def update_stock(
         self, db: AsyncSession, quantity_change: int, is_sale: bool = False
@@ -81,24 +229,10 @@ class Product(BaseModel, table=True):
         self.updated_at = datetime.now()
 
         # Create stock movement record
-        movement = StockMovement(
-            product_id=self.id,
-            quantity=abs(quantity_change),
-            movement_type=(
-                MovementType.SALE
-                if is_sale
-                else (
-                    MovementType.ADDITION
-                    if quantity_change > 0
-                    else MovementType.REMOVAL
-                )
-            ),
-        )
-        db.add(movement)
+        db.add(_stock_movement(self.id, quantity_change, is_sale))
 
         db.add(self)
         await db.commit()
-        await db.refresh(self)
         return self
 
 
@@ -116,6 +250,14 @@ class Supplier(BaseModel, table=True):
     # Relationships
     products: list[Product] = Relationship(back_populates="supplier")
 
+    @classmethod
+    async def delete_by_id(cls, db: AsyncSession, id: int) -> Optional["Supplier"]:
+        """Delete a supplier by ID, detaching its products first."""
+        await db.execute(
+            update(Product).where(Product.supplier_id == id).values(supplier_id=None)
+        )
+        return await super().delete_by_id(db, id)
+
 
 class MovementType(str, Enum):
     """Stock movement type enumeration."""
@@ -127,6 +269,26 @@ class MovementType(str, Enum):
     ADJUSTMENT = "adjustment"
 
 
+# Movement type for a stock change, keyed by (is_sale, is_increase)
+_MOVEMENT_TYPES = {
+    (True, True): MovementType.SALE,
+    (True, False): MovementType.SALE,
+    (False, True): MovementType.ADDITION,
+    (False, False): MovementType.REMOVAL,
+}
+
+
+def _stock_movement(
+    product_id: int, quantity_change: int, is_sale: bool
+) -> "StockMovement":
+    """Build the stock movement record for a stock change."""
+    return StockMovement(
+        product_id=product_id,
+        quantity=abs(quantity_change),
+        movement_type=_MOVEMENT_TYPES[is_sale, quantity_change > 0],
+    )
+
+
 class StockMovement(BaseModel, table=True):
     """Stock movement model for tracking inventory changes."""
 
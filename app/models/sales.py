@@ -1,8 +1,8 @@
 from datetime import datetime
 from enum import Enum
-from typing import ClassVar, List, Optional
+from typing import Any, ClassVar, Dict, List, Optional, Tuple
 
-from sqlalchemy import select
+from sqlalchemy import Index, bindparam, func, inspect, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from sqlmodel import Field, Relationship
@@ -34,6 +34,17 @@ class Order(BaseModel, table=True):
     """Order model for sales management."""
 
     __tablename__: ClassVar[str] = "orders"
+    __table_args__ = (
+        # Lets sales reports read totals by status and date from the index
+        Index(
+            "ix_orders_status_created_at",
+            "status",
+            "created_at",
+            postgresql_include=["total_amount"],
+        ),
+        # Date range listings filter on created_at regardless of status
+        Index("ix_orders_created_at", "created_at"),
+    )
 
     customer_name: str = Field(default="")
     total_amount: float = Field(default=0.0)
@@ -47,16 +58,36 @@ class Order(BaseModel, table=True):
     @classmethod
     async def get_by_id(cls, db: AsyncSession, id: int) -> Optional["Order"]:
         """Get an order by ID with items preloaded."""
-        query = select(cls).where(cls.id == id).options(selectinload(cls.items))
-        result = await db.execute(query)
+        query = cls._statement(
+            "get_by_id_with_items",
+            lambda: select(cls)
+            .where(cls.id == bindparam("id"))
+            .options(selectinload(cls.items)),
+        )
+        result = await db.execute(query, {"id": id})
         return result.scalar_one_or_none()
 
     @classmethod
     async def get_all(
-        cls, db: AsyncSession, skip: int = 0, limit: int = 100
+        cls,
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        before_id: Optional[int] = None,
+        with_items: bool = False,
     ) -> List["Order"]:
-        """Get all orders with items preloaded."""
-        query = select(cls).options(selectinload(cls.items)).offset(skip).limit(limit)
+        """
+        Get all orders, newest first.
+
+        Pass the last seen ID as before_id to page without an OFFSET scan,
+        and with_items=True to preload each order's items in one extra query.
+        """
+        query = select(cls).order_by(cls.id.desc())
+        if with_items:
+            query = query.options(selectinload(cls.items))
+        if before_id is not None:
+            query = query.where(cls.id < before_id)
+        query = query.offset(skip).limit(limit)
         result = await db.execute(query)
         return result.scalars().all()
 
@@ -68,58 +99,158 @@ class Order(BaseModel, table=True):
         end_date: datetime,
         skip: int = 0,
         limit: int = 100,
+        with_items: bool = False,
     ) -> List["Order"]:
-        """Get orders within a date range."""
+        """
+        Get orders within a date range.
+
+        Pass with_items=True to preload each order's items.
+        """
         query = (
             select(cls)
             .where(cls.created_at >= start_date)
             .where(cls.created_at <= end_date)
-            .options(selectinload(cls.items))
             .offset(skip)
             .limit(limit)
         )
+        if with_items:
+            query = query.options(selectinload(cls.items))
         result = await db.execute(query)
         return result.scalars().all()
 
-    async def calculate_total(self, db: AsyncSession) -> float:
-        """Calculate the total amount of the order."""
-        # Explicitly load order items to avoid lazy loading issues
-        query = select(OrderItem).where(OrderItem.order_id == self.id)
+    @classmethod
+    async def get_sales_totals(
+        cls, db: AsyncSession, start_date: datetime, end_date: datetime
+    ) -> Tuple[float, int]:
+        """
+        Get total sales and order count of completed orders within a date range.
+
+        Both values are aggregated from the stored order totals in a single
+        query, without reading order items.
+
+        Returns:
+            Tuple of (total sales, completed order count)
+        """
+        query = (
+            select(
+                func.coalesce(func.sum(cls.total_amount), 0.0),
+                func.count(cls.id),
+            )
+            .where(cls.status == OrderStatus.COMPLETED)
+            .where(cls.created_at >= start_date)
+            .where(cls.created_at <= end_date)
+        )
+        result = await db.execute(query)
+        total_sales, order_count = result.one()
+        return float(total_sales), order_count
+
+    @classmethod
+    async def get_daily_sales_totals(
+        cls, db: AsyncSession, start_date: datetime, end_date: datetime
+    ) -> List[Dict[str, Any]]:
+        """
+        Get total sales and order count of completed orders per day.
+
+        The grouping is done in the database, so memory use is bounded by the
+        number of days rather than the number of orders.
+
+        Returns:
+            List of {"date", "total_sales", "order_count"} dicts ordered by day
+        """
+        if db.get_bind().dialect.name == "postgresql":
+            day = func.date_trunc("day", cls.created_at)
+        else:
+            day = func.date(cls.created_at)
+
+        query = (
+            select(
+                day,
+                func.coalesce(func.sum(cls.total_amount), 0.0),
+                func.count(cls.id),
+            )
+            .where(cls.status == OrderStatus.COMPLETED)
+            .where(cls.created_at >= start_date)
+            .where(cls.created_at <= end_date)
+            .group_by(day)
+            .order_by(day)
+        )
         result = await db.execute(query)
-        items = result.scalars().all()
 
-        total = 0.0
-        for item in items:
-            total += item.quantity * item.unit_price
+        daily_sales = []
+        for day_value, total_sales, order_count in result.all():
+            # date_trunc returns a datetime, SQLite's date() an ISO string
+            if not isinstance(day_value, str):
+                day_value = day_value.date().isoformat()
+            daily_sales.append(
+                {
+                    "date": day_value,
+                    "total_sales": float(total_sales),
+                    "order_count": order_count,
+                }
+            )
+        return daily_sales
+
+    async def calculate_total(self, db: AsyncSession) -> float:
+        """Calculate the total amount of the order."""
+        # Sum in the database rather than loading every item row
+        query = OrderItem._statement(
+            "sum_by_order_id",
+            lambda: select(
+                func.coalesce(func.sum(OrderItem.quantity * OrderItem.unit_price), 0)
+            ).where(OrderItem.order_id == bindparam("order_id")),
+        )
+        result = await db.execute(query, {"order_id": self.id})
+        total = float(result.scalar_one())
 
         self.total_amount = total
         db.add(self)
         await db.commit()
-        await db.refresh(self)
         return total
 
+    async def load_items(self, db: AsyncSession) -> List["OrderItem"]:
+        """
+        Return the order's items, querying them only if they were not
+        preloaded (get_by_id and with_items=True preload them).
+        """
+        if "items" in inspect(self).unloaded:
+            await db.refresh(self, ["items"])
+        return self.items
+
     async def complete(self, db: AsyncSession) -> "Order":
-        """Complete the order and update inventory."""
+        """
+        Complete the order and update inventory.
+
+        Items whose product has since been deleted are skipped.
+
+        Raises:
+            ValueError: If a product no longer has enough stock; nothing is
+                changed in that case
+        """
         if self.status != OrderStatus.PENDING:
             return self
 
         # Update order status
         self.status = OrderStatus.COMPLETED
         db.add(self)
+        items = await self.load_items(db)
 
-        # Explicitly load order items to avoid lazy loading issues
-        query = select(OrderItem).where(OrderItem.order_id == self.id)
-        result = await db.execute(query)
-        items = result.scalars().all()
-
-        # Update inventory for each item
-        for item in items:
-            product = await Product.get_by_id(db, id=item.product_id)
-            if product:
-                await product.update_stock(db, -item.quantity, is_sale=True)
+        # One guarded UPDATE for all products, so concurrent orders cannot
+        # take stock below zero; it commits together with the status change
+        changes = _quantities_by_product(items, sign=-1)
+        updated = await Product.adjust_stock_many(
+            db, changes, is_sale=True, commit=False
+        )
+        skipped = set(changes) - updated
+        if skipped:
+            # Products deleted since the order was placed are skipped; only
+            # products that still exist are short of stock
+            result = await db.execute(select(Product.id).where(Product.id.in_(skipped)))
+            short = set(result.scalars().all())
+            if short:
+                await db.rollback()
+                raise ValueError(f"Insufficient stock for product with ID {min(short)}")
 
         await db.commit()
-        await db.refresh(self)
         return self
 
     async def cancel(self, db: AsyncSession) -> "Order":
@@ -130,7 +261,6 @@ class Order(BaseModel, table=True):
         self.status = OrderStatus.CANCELLED
         db.add(self)
         await db.commit()
-        await db.refresh(self)
         return self
 
     async def refund(self, db: AsyncSession) -> "Order":
@@ -141,29 +271,33 @@ class Order(BaseModel, table=True):
         # Update order status
         self.status = OrderStatus.REFUNDED
         db.add(self)
+        items = await self.load_items(db)
 
-        # Explicitly load order items to avoid lazy loading issues
-        query = select(OrderItem).where(OrderItem.order_id == self.id)
-        result = await db.execute(query)
-        items = result.scalars().all()
-
-        # Update inventory for each item
-        for item in items:
-            product = await Product.get_by_id(db, id=item.product_id)
-            if product:
-                await product.update_stock(db, item.quantity, is_sale=False)
+        # Return the stock in one UPDATE; deleted products are skipped
+        await Product.adjust_stock_many(
+            db, _quantities_by_product(items), is_sale=False, commit=False
+        )
 
         await db.commit()
-        await db.refresh(self)
         return self
 
 
+def _quantities_by_product(items: List["OrderItem"], sign: int = 1) -> Dict[int, int]:
+    """Sum order item quantities per product, multiplied by sign."""
+    changes: Dict[int, int] = {}
+    for item in items:
+        changes[item.product_id] = (
+            changes.get(item.product_id, 0) + sign * item.quantity
+        )
+    return changes
+
+
 class OrderItem(BaseModel, table=True):
     """Order item model for sales management."""
 
     __tablename__: ClassVar[str] = "order_items"
 
-    order_id: int = Field(foreign_key="orders.id")
+    order_id: int = Field(foreign_key="orders.id", index=True)
     product_id: int = Field(foreign_key="products.id")
     quantity: int = Field(default=1)
     unit_price: float = Field(default=0.0)
@@ -1,8 +1,11 @@
+import asyncio
+import time
 from enum import Enum
-from typing import ClassVar, Optional, Union
+from typing import Any, ClassVar, Dict, Optional, Tuple, Union
 
-from sqlalchemy import Column, String, select
+from sqlalchemy import Column, String, bindparam, event, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached, object_session
 from sqlmodel import Field
 
 from app.core.password import get_password_hash, verify_password
@@ -17,6 +20,21 @@ class UserRole(str, Enum):
     CASHIER = "cashier"
 
 
+# Values of the built-in roles
+STANDARD_ROLES = frozenset(role.value for role in UserRole)
+
+
+# Column snapshots of recently loaded users: user_id -> (cached_until, columns).
+# Kept per process: with several workers, a change made through one worker is
+# seen by the others only once their snapshot expires, up to USER_CACHE_TTL.
+_USER_CACHE: Dict[int, Tuple[float, Dict[str, Any]]] = {}
+USER_CACHE_TTL = 30  # seconds
+USER_CACHE_MAX_SIZE = 10_000
+
+# Session.info key collecting IDs of users changed in the open transaction
+_STALE_USERS_KEY = "stale_cached_users"
+
+
 class User(BaseModel, table=True):
     """User model for authentication and authorization."""
 
@@ -27,15 +45,54 @@ class User(BaseModel, table=True):
     )
     hashed_password: str = Field(nullable=False)
     full_name: str = Field(nullable=False)
-    role: str = Field(default=UserRole.CASHIER)  # Can be standard or custom role
+    # Can be standard or custom role; indexed for role-in-use checks
+    role: str = Field(default=UserRole.CASHIER, index=True)
     is_active: bool = Field(default=True)
     is_superuser: bool = Field(default=False)
 
+    @classmethod
+    async def get_cached(cls, db: AsyncSession, user_id: int) -> Optional["User"]:
+        """
+        Get a user by ID, reusing a snapshot loaded within USER_CACHE_TTL.
+
+        A cache hit is merged into the given session without a query, so the
+        returned instance belongs to the caller's session like a loaded row.
+        The cache is per worker process; changes committed through another
+        worker show up here only after the snapshot expires.
+        """
+        cached = _USER_CACHE.get(user_id)
+        if cached is not None and time.monotonic() < cached[0]:
+            user = cls(**cached[1])
+            make_transient_to_detached(user)
+            return await db.merge(user, load=False)
+
+        user = await cls.get_by_id(db, user_id)
+        if user is None:
+            _USER_CACHE.pop(user_id, None)
+        else:
+            if len(_USER_CACHE) >= USER_CACHE_MAX_SIZE:
+                _USER_CACHE.clear()
+            _USER_CACHE[user_id] = (
+                time.monotonic() + USER_CACHE_TTL,
+                user.model_dump(),
+            )
+        return user
+
+    @staticmethod
+    def invalidate_cache(user_id: Optional[int] = None) -> None:
+        """Drop one cached user, or all of them when no ID is given."""
+        if user_id is None:
+            _USER_CACHE.clear()
+        else:
+            _USER_CACHE.pop(user_id, None)
+
     @classmethod
     async def get_by_email(cls, db: AsyncSession, email: str) -> Optional["User"]:
         """Get a user by email."""
-        query = select(cls).where(cls.email == email)
-        result = await db.execute(query)
+        query = cls._statement(
+            "get_by_email", lambda: select(cls).where(cls.email == bindparam("email"))
+        )
+        result = await db.execute(query, {"email": email})
         return result.scalar_one_or_none()
 
     @classmethod
@@ -46,9 +103,11 @@ class User(BaseModel, table=True):
         if isinstance(role, UserRole):
             role = role.value
 
+        # Hash in a worker thread so bcrypt does not block the event loop
+        hashed_password = await asyncio.to_thread(get_password_hash, obj_in["password"])
         db_obj = cls(
             email=obj_in["email"],
-            hashed_password=get_password_hash(obj_in["password"]),
+            hashed_password=hashed_password,
             full_name=obj_in["full_name"],
             role=role,
             is_active=obj_in.get("is_active", True),
@@ -56,7 +115,6 @@ class User(BaseModel, table=True):
         )
         db.add(db_obj)
         await db.commit()
-        await db.refresh(db_obj)
         return db_obj
 
     def verify_password(self, password: str) -> bool:
@@ -65,10 +123,9 @@ class User(BaseModel, table=True):
 
     async def update_password(self, db: AsyncSession, new_password: str) -> None:
         """Update the user's password."""
-        self.hashed_password = get_password_hash(new_password)
+        self.hashed_password = await asyncio.to_thread(get_password_hash, new_password)
         db.add(self)
         await db.commit()
-        await db.refresh(self)
 
     def has_standard_role(self, role: UserRole) -> bool:
         """Check if the user has a specific standard role."""
@@ -79,3 +136,24 @@ class User(BaseModel, table=True):
         if isinstance(role, UserRole):
             return self.role == role.value
         return self.role == role
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _mark_cached_user_stale(mapper, connection, target: User) -> None:
+    """Remember a flushed user change until its transaction commits."""
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_STALE_USERS_KEY, set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_cached_users(session: Session) -> None:
+    """
+    Forget snapshots of users changed in the committed transaction.
+
+    Dropping them at flush time instead would let a concurrent get_cached
+    re-cache the old committed row before this transaction commits.
+    """
+    for user_id in session.info.pop(_STALE_USERS_KEY, ()):
+        User.invalidate_cache(user_id)
@@ -1,9 +1,24 @@
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
 from app.models.inventory import MovementType, ProductCategory
 
+# Literal mirrors of the enums for response models (see app.schemas.sales)
+ProductCategoryValue = Literal[
+    "grocery",
+    "dairy",
+    "meat",
+    "produce",
+    "bakery",
+    "frozen",
+    "beverages",
+    "household",
+    "personal_care",
+    "other",
+]
+MovementTypeValue = Literal["addition", "removal", "sale", "return", "adjustment"]
+
 
 # Product schemas
 class ProductBase(BaseModel):
@@ -19,6 +34,10 @@ class ProductBase(BaseModel):
     reorder_level: Optional[int] = None
     supplier_id: Optional[int] = None
 
+    # Build core schemas on first use rather than at import; subclasses
+    # inherit this, and routes build the ones they use when registered
+    model_config = ConfigDict(defer_build=True)
+
 
 class ProductCreate(ProductBase):
     """Product creation schema."""
@@ -39,8 +58,9 @@ class ProductResponse(ProductBase):
 
     id: int
     name: str
+    description: str
     sku: str
-    category: ProductCategory
+    category: ProductCategoryValue
     price: float
     cost: float
     quantity: int
@@ -59,6 +79,8 @@ class SupplierBase(BaseModel):
     phone: Optional[str] = None
     address: Optional[str] = None
 
+    model_config = ConfigDict(defer_build=True)
+
 
 class SupplierCreate(SupplierBase):
     """Supplier creation schema."""
@@ -75,6 +97,10 @@ class SupplierResponse(SupplierBase):
 
     id: int
     name: str
+    contact_name: str
+    email: str
+    phone: str
+    address: str
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -88,6 +114,8 @@ class StockMovementBase(BaseModel):
     movement_type: Optional[MovementType] = None
     notes: Optional[str] = None
 
+    model_config = ConfigDict(defer_build=True)
+
 
 class StockMovementCreate(StockMovementBase):
     """Stock movement creation schema."""
@@ -104,7 +132,8 @@ class StockMovementResponse(StockMovementBase):
     id: int
     product_id: int
     quantity: int
-    movement_type: MovementType
+    movement_type: MovementTypeValue
+    notes: str
     created_at: str
 
     model_config = ConfigDict(from_attributes=True)
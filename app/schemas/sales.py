@@ -1,10 +1,18 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
 from app.models.sales import OrderStatus, PaymentMethod
 
+# Literal mirrors of the enums for response models: pydantic validates a
+# Literal with a plain lookup instead of the Enum validator, and the values
+# serialize unchanged. Request bodies keep the Enums.
+PaymentMethodValue = Literal[
+    "cash", "credit_card", "debit_card", "mobile_payment", "other"
+]
+OrderStatusValue = Literal["pending", "completed", "cancelled", "refunded"]
+
 
 # Order item schemas
 class OrderItemBase(BaseModel):
@@ -14,6 +22,8 @@ class OrderItemBase(BaseModel):
     quantity: Optional[int] = None
     unit_price: Optional[float] = None
 
+    model_config = ConfigDict(defer_build=True)
+
 
 class OrderItemCreate(OrderItemBase):
     """Order item creation schema."""
@@ -45,6 +55,8 @@ class OrderBase(BaseModel):
     payment_method: Optional[PaymentMethod] = None
     cashier_id: Optional[int] = None
 
+    model_config = ConfigDict(defer_build=True)
+
 
 class OrderCreate(OrderBase):
     """Order creation schema."""
@@ -66,8 +78,8 @@ class OrderResponse(OrderBase):
     id: int
     customer_name: str
     total_amount: float
-    payment_method: PaymentMethod
-    status: OrderStatus
+    payment_method: PaymentMethodValue
+    status: OrderStatusValue
     cashier_id: Optional[int]
     created_at: datetime
     items: List[OrderItemResponse]
@@ -1,6 +1,6 @@
 from typing import Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class Token(BaseModel):
@@ -15,3 +15,5 @@ class TokenPayload(BaseModel):
 
     sub: Optional[str] = None
     exp: Optional[float] = None
+
+    model_config = ConfigDict(defer_build=True)
@@ -1,9 +1,9 @@
-from typing import List, Optional, Set, Union
+from typing import List, Optional, Set
 
 from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
 
 from app.core.permissions import PermissionType
-from app.models.user import UserRole
+from app.models.user import STANDARD_ROLES, UserRole
 
 
 # Shared properties
@@ -13,7 +13,10 @@ class UserBase(BaseModel):
     email: Optional[EmailStr] = None
     full_name: Optional[str] = None
     is_active: Optional[bool] = True
-    role: Optional[Union[UserRole, str]] = UserRole.CASHIER
+    # Standard or custom role name; UserRole members validate as their value
+    role: Optional[str] = UserRole.CASHIER.value
+
+    model_config = ConfigDict(defer_build=True)
 
 
 # Properties to receive via API on creation
@@ -53,6 +56,8 @@ class UserLogin(BaseModel):
     email: EmailStr
     password: str
 
+    model_config = ConfigDict(defer_build=True)
+
 
 # Custom role schemas
 class CustomRoleCreate(BaseModel):
@@ -65,7 +70,7 @@ class CustomRoleCreate(BaseModel):
     @classmethod
     def name_must_not_be_standard_role(cls, v):
         """Validate that the name is not a standard role."""
-        if v in [role.value for role in UserRole]:
+        if v in STANDARD_ROLES:
             raise ValueError(f"Role name '{v}' is a standard role and cannot be used")
         return v
 
@@ -75,3 +80,5 @@ class CustomRoleResponse(BaseModel):
 
     name: str
     permissions: List[PermissionType]
+
+    model_config = ConfigDict(defer_build=True)
@@ -1,5 +1,23 @@
-# Import services for easy access
-from app.services.inventory_service import product_manager, supplier_manager
-from app.services.role_service import role_service
-from app.services.sales_service import order_manager
-from app.services.user_service import user_manager
+# Services for easy access, imported from their modules on first use so
+# importing one service (or app.services itself) doesn't load all of them
+from importlib import import_module
+from typing import Any
+
+_SERVICE_MODULES = {
+    "product_manager": "app.services.inventory_service",
+    "supplier_manager": "app.services.inventory_service",
+    "role_service": "app.services.role_service",
+    "order_manager": "app.services.sales_service",
+    "user_manager": "app.services.user_service",
+}
+
+__all__ = list(_SERVICE_MODULES)
+
+
+def __getattr__(name: str) -> Any:
+    module = _SERVICE_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
@@ -1,11 +1,18 @@
-from fastapi import HTTPException, status
+import sys
+
 from sqlalchemy.sql import Select
 
 from app.core.permissions import PermissionRegistry
-from app.core.query_manager import QueryManager
+from app.core.query_manager import NO_ROWS, QueryManager
 from app.models.inventory import Product, Supplier
 from app.models.user import User
 
+# Permission names, interned to match the registry's strings by identity
+_INVENTORY_READ = sys.intern("inventory:read")
+_INVENTORY_CREATE = sys.intern("inventory:create")
+_INVENTORY_UPDATE = sys.intern("inventory:update")
+_INVENTORY_DELETE = sys.intern("inventory:delete")
+
 
 class ProductQueryManager(QueryManager[Product]):
     """Query manager for Product model."""
@@ -27,11 +34,11 @@ class ProductQueryManager(QueryManager[Product]):
             Filtered query
         """
         # If user has read permission, return all products
-        if user and PermissionRegistry.has_permission(user, "inventory:read"):
+        if user and PermissionRegistry.has_permission(user, _INVENTORY_READ):
             return query
 
         # If no user or no permission, return no products
-        return query.where(False)
+        return query.where(NO_ROWS)
 
     def check_create_permission(self, user: User = None) -> None:
         """
@@ -43,11 +50,9 @@ class ProductQueryManager(QueryManager[Product]):
         Raises:
             HTTPException: If user doesn't have permission
         """
-        if not user or not PermissionRegistry.has_permission(user, "inventory:create"):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not enough permissions to create products",
-            )
+        self._require(
+            user, _INVENTORY_CREATE, "Not enough permissions to create products"
+        )
 
     def check_update_permission(self, obj: Product, user: User = None) -> None:
         """
@@ -60,11 +65,9 @@ class ProductQueryManager(QueryManager[Product]):
         Raises:
             HTTPException: If user doesn't have permission
         """
-        if not user or not PermissionRegistry.has_permission(user, "inventory:update"):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not enough permissions to update products",
-            )
+        self._require(
+            user, _INVENTORY_UPDATE, "Not enough permissions to update products"
+        )
 
     def check_delete_permission(self, obj: Product, user: User = None) -> None:
         """
@@ -77,11 +80,9 @@ class ProductQueryManager(QueryManager[Product]):
         Raises:
             HTTPException: If user doesn't have permission
         """
-        if not user or not PermissionRegistry.has_permission(user, "inventory:delete"):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not enough permissions to delete products",
-            )
+        self._require(
+            user, _INVENTORY_DELETE, "Not enough permissions to delete products"
+        )
 
 
 class SupplierQueryManager(QueryManager[Supplier]):
@@ -103,11 +104,11 @@ class SupplierQueryManager(QueryManager[Supplier]):
             Filtered query
         """
         # If user has read permission, return all suppliers
-        if user and PermissionRegistry.has_permission(user, "inventory:read"):
+        if user and PermissionRegistry.has_permission(user, _INVENTORY_READ):
             return query
 
         # If no user or no permission, return no suppliers
-        return query.where(False)
+        return query.where(NO_ROWS)
 
     def check_create_permission(self, user: User = None) -> None:
         """
@@ -119,11 +120,9 @@ class SupplierQueryManager(QueryManager[Supplier]):
         Raises:
             HTTPException: If user doesn't have permission
         """
-        if not user or not PermissionRegistry.has_permission(user, "inventory:create"):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not enough permissions to create suppliers",
-            )
+        self._require(
+            user, _INVENTORY_CREATE, "Not enough permissions to create suppliers"
+        )
 
     def check_update_permission(self, obj: Supplier, user: User = None) -> None:
         """
@@ -136,11 +135,9 @@ class SupplierQueryManager(QueryManager[Supplier]):
         Raises:
             HTTPException: If user doesn't have permission
         """
-        if not user or not PermissionRegistry.has_permission(user, "inventory:update"):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not enough permissions to update suppliers",
-            )
+        self._require(
+            user, _INVENTORY_UPDATE, "Not enough permissions to update suppliers"
+        )
 
     def check_delete_permission(self, obj: Supplier, user: User = None) -> None:
         """
@@ -153,11 +150,9 @@ class SupplierQueryManager(QueryManager[Supplier]):
         Raises:
             HTTPException: If user doesn't have permission
         """
-        if not user or not PermissionRegistry.has_permission(user, "inventory:delete"):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not enough permissions to delete suppliers",
-            )
+        self._require(
+            user, _INVENTORY_DELETE, "Not enough permissions to delete suppliers"
+        )
 
 
 # Create instances for use in API routes
@@ -1,35 +1,56 @@
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Set, Tuple
 
 from fastapi import HTTPException, status
+from sqlalchemy import exists, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.permissions import PermissionRegistry
-from app.models.user import UserRole
+from app.models.user import STANDARD_ROLES, User
+from app.schemas.role import RoleResponse
+
+
+def _role_response(role_name: str, permissions: Set[str]) -> RoleResponse:
+    """Build a RoleResponse without validation; the registry already checked it."""
+    return RoleResponse.model_construct(name=role_name, permissions=sorted(permissions))
 
 
 class RoleService:
     """Service for managing roles and permissions."""
 
-    @staticmethod
-    async def get_all_permissions() -> List[str]:
+    # Sorted listings, tagged with the PermissionRegistry version they reflect
+    _permissions_cache: Optional[Tuple[int, List[str]]] = None
+    _roles_cache: Optional[Tuple[int, Dict[str, List[str]]]] = None
+
+    @classmethod
+    async def get_all_permissions(cls) -> List[str]:
         """
         Get all available permissions.
 
         Returns:
             List of all permissions
         """
-        return sorted(list(PermissionRegistry.get_all_permissions()))
-
-    @staticmethod
-    async def get_all_roles() -> Dict[str, List[str]]:
+        version = PermissionRegistry.version
+        if cls._permissions_cache is None or cls._permissions_cache[0] != version:
+            permissions = sorted(PermissionRegistry.get_all_permissions())
+            cls._permissions_cache = (version, permissions)
+        return cls._permissions_cache[1]
+
+    @classmethod
+    async def get_all_roles(cls) -> Dict[str, List[str]]:
         """
         Get all roles with their permissions.
 
         Returns:
             Dictionary of roles and their permissions
         """
-        roles = PermissionRegistry.get_all_roles()
-        return {role: sorted(list(permissions)) for role, permissions in roles.items()}
+        version = PermissionRegistry.version
+        if cls._roles_cache is None or cls._roles_cache[0] != version:
+            roles = PermissionRegistry.get_all_roles()
+            cls._roles_cache = (
+                version,
+                {role: sorted(permissions) for role, permissions in roles.items()},
+            )
+        return cls._roles_cache[1]
 
     @staticmethod
     async def get_role_permissions(role: str) -> List[str]:
@@ -46,17 +67,15 @@ class RoleService:
             HTTPException: If role doesn't exist
         """
         permissions = PermissionRegistry.get_role_permissions(role)
-        if not permissions and role not in [r.value for r in UserRole]:
+        if not permissions and role not in STANDARD_ROLES:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Role '{role}' not found",
             )
-        return sorted(list(permissions))
+        return sorted(permissions)
 
     @staticmethod
-    async def create_custom_role(
-        role_name: str, permissions: Set[str]
-    ) -> Dict[str, List[str]]:
+    async def create_custom_role(role_name: str, permissions: Set[str]) -> RoleResponse:
         """
         Create a new custom role.
 
@@ -65,7 +84,7 @@ class RoleService:
             permissions: Set of permissions for the role
 
         Returns:
-            Dictionary with role name and permissions
+            Role name and sorted permissions
 
         Raises:
             HTTPException: If role already exists or permissions are invalid
@@ -79,7 +98,7 @@ class RoleService:
             )
 
         # Check if role name is a standard role
-        if role_name in [r.value for r in UserRole]:
+        if role_name in STANDARD_ROLES:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Role name '{role_name}' is a standard role and cannot be used",
@@ -93,15 +112,10 @@ class RoleService:
                 detail=str(e),
             )
 
-        return {
-            "name": role_name,
-            "permissions": sorted(list(permissions)),
-        }
+        return _role_response(role_name, permissions)
 
     @staticmethod
-    async def update_custom_role(
-        role_name: str, permissions: Set[str]
-    ) -> Dict[str, List[str]]:
+    async def update_custom_role(role_name: str, permissions: Set[str]) -> RoleResponse:
         """
         Update a custom role's permissions.
 
@@ -110,13 +124,13 @@ class RoleService:
             permissions: Set of permissions for the role
 
         Returns:
-            Dictionary with role name and permissions
+            Role name and sorted permissions
 
         Raises:
             HTTPException: If role doesn't exist or permissions are invalid
         """
         # Check if role exists and is a custom role
-        if role_name in [r.value for r in UserRole]:
+        if role_name in STANDARD_ROLES:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Cannot update standard role '{role_name}'",
@@ -137,15 +151,10 @@ class RoleService:
                 detail=str(e),
             )
 
-        return {
-            "name": role_name,
-            "permissions": sorted(list(permissions)),
-        }
+        return _role_response(role_name, permissions)
 
     @staticmethod
-    async def delete_custom_role(
-        role_name: str, db: AsyncSession
-    ) -> Dict[str, List[str]]:
+    async def delete_custom_role(role_name: str, db: AsyncSession) -> RoleResponse:
         """
         Delete a custom role.
 
@@ -154,13 +163,13 @@ class RoleService:
             db: Database session
 
         Returns:
-            Dictionary with role name and permissions
+            Role name and sorted permissions
 
         Raises:
             HTTPException: If role doesn't exist or is in use
         """
         # Check if role exists and is a custom role
-        if role_name in [r.value for r in UserRole]:
+        if role_name in STANDARD_ROLES:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Cannot delete standard role '{role_name}'",
@@ -173,29 +182,23 @@ class RoleService:
                 detail=f"Role '{role_name}' not found",
             )
 
-        # Check if any users have this role
-        from sqlalchemy import text
-
-        query = text("SELECT COUNT(*) FROM users WHERE role = :role")
-        result = await db.execute(query, {"role": role_name})
-        count = result.scalar()
+        # Check if any users have this role; EXISTS stops at the first match
+        query = select(exists().where(User.role == role_name))
+        result = await db.execute(query)
 
-        if count > 0:
+        if result.scalar():
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Cannot delete role '{role_name}' because it is assigned to {count} users",
+                detail=f"Cannot delete role '{role_name}' because it is assigned to users",
             )
 
         # Get permissions before deleting
-        permissions = list(PermissionRegistry.get_role_permissions(role_name))
+        permissions = PermissionRegistry.get_role_permissions(role_name)
 
         # Delete the role
-        PermissionRegistry._custom_permissions.pop(role_name, None)
+        PermissionRegistry.remove_custom_role(role_name)
 
-        return {
-            "name": role_name,
-            "permissions": sorted(permissions),
-        }
+        return _role_response(role_name, permissions)
 
 
 # Create instance for use in API routes
@@ -1,11 +1,25 @@
+import sys
+
 from fastapi import HTTPException, status
+from sqlalchemy import select
 from sqlalchemy.sql import Select
 
 from app.core.permissions import PermissionRegistry
-from app.core.query_manager import QueryManager
+from app.core.query_manager import NO_ROWS, QueryManager
 from app.models.sales import Order
 from app.models.user import User
 
+# Permission names, interned to match the registry's strings by identity
+_SALES_READ = sys.intern("sales:read")
+_SALES_CREATE = sys.intern("sales:create")
+_SALES_UPDATE = sys.intern("sales:update")
+_SALES_COMPLETE = sys.intern("sales:complete")
+_USERS_READ = sys.intern("users:read")
+
+# Statements are immutable, so the deny path can share one empty query
+# instead of building a new WHERE chain per call
+_NO_ORDERS = select(Order).where(NO_ROWS)
+
 
 class OrderQueryManager(QueryManager[Order]):
     """Query manager for Order model."""
@@ -26,12 +40,23 @@ class OrderQueryManager(QueryManager[Order]):
         Returns:
             Filtered query
         """
-        # If no user or user doesn't have read permission, return no orders
-        if not user or not PermissionRegistry.has_permission(user, "sales:read"):
-            return query.where(False)
+        # If no user, return no orders
+        if not user:
+            return _NO_ORDERS
+
+        # Superusers have all permissions
+        if user.is_superuser:
+            return query
+
+        # One registry lookup for the role, then plain set membership tests
+        permissions = PermissionRegistry.get_role_permissions(user.role)
+
+        # Without read permission, return no orders
+        if _SALES_READ not in permissions:
+            return _NO_ORDERS
 
         # Admins and managers can see all orders
-        if user.is_superuser or PermissionRegistry.has_permission(user, "users:read"):
+        if _USERS_READ in permissions:
             return query
 
         # Cashiers can only see their own orders
@@ -47,11 +72,7 @@ class OrderQueryManager(QueryManager[Order]):
         Raises:
             HTTPException: If user doesn't have permission
         """
-        if not user or not PermissionRegistry.has_permission(user, "sales:create"):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not enough permissions to create orders",
-            )
+        self._require(user, _SALES_CREATE, "Not enough permissions to create orders")
 
     def check_update_permission(self, obj: Order, user: User = None) -> None:
         """
@@ -71,10 +92,10 @@ class OrderQueryManager(QueryManager[Order]):
             )
 
         # Check general update permission
-        if not PermissionRegistry.has_permission(user, "sales:update"):
+        if not PermissionRegistry.has_permission(user, _SALES_UPDATE):
             # Cashiers can update their own orders if they have complete permission
             if obj.cashier_id == user.id and PermissionRegistry.has_permission(
-                user, "sales:complete"
+                user, _SALES_COMPLETE
             ):
                 return
 
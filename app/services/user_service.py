@@ -1,10 +1,18 @@
+import sys
+
 from fastapi import HTTPException, status
 from sqlalchemy.sql import Select
 
 from app.core.permissions import PermissionRegistry
-from app.core.query_manager import QueryManager
+from app.core.query_manager import NO_ROWS, QueryManager
 from app.models.user import User
 
+# Permission names, interned to match the registry's strings by identity
+_USERS_READ = sys.intern("users:read")
+_USERS_CREATE = sys.intern("users:create")
+_USERS_UPDATE = sys.intern("users:update")
+_USERS_DELETE = sys.intern("users:delete")
+
 
 class UserQueryManager(QueryManager[User]):
     """Query manager for User model."""
@@ -27,10 +35,10 @@ class UserQueryManager(QueryManager[User]):
         """
         # If no user, return no users
         if not user:
-            return query.where(False)
+            return query.where(NO_ROWS)
 
         # If user has read permission, return all users
-        if PermissionRegistry.has_permission(user, "users:read"):
+        if PermissionRegistry.has_permission(user, _USERS_READ):
             return query
 
         # Otherwise, return only the user themselves
@@ -47,7 +55,7 @@ class UserQueryManager(QueryManager[User]):
             HTTPException: If user doesn't have permission
         """
         # Allow user creation without authentication for registration
-        if user and not PermissionRegistry.has_permission(user, "users:create"):
+        if user and not PermissionRegistry.has_permission(user, _USERS_CREATE):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Not enough permissions to create users",
@@ -76,11 +84,9 @@ class UserQueryManager(QueryManager[User]):
             return
 
         # Otherwise, check update permission
-        if not PermissionRegistry.has_permission(user, "users:update"):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not enough permissions to update other users",
-            )
+        self._require(
+            user, _USERS_UPDATE, "Not enough permissions to update other users"
+        )
 
     def check_delete_permission(self, obj: User, user: User = None) -> None:
         """
@@ -108,11 +114,7 @@ class UserQueryManager(QueryManager[User]):
             )
 
         # Check delete permission
-        if not PermissionRegistry.has_permission(user, "users:delete"):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not enough permissions to delete users",
-            )
+        self._require(user, _USERS_DELETE, "Not enough permissions to delete users")
 
 
 # Create instance for use in API routes
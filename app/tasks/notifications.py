@@ -1,10 +1,22 @@
+import asyncio
 import logging
-from typing import List
-
-from fastapi import BackgroundTasks
+from typing import Sequence, Set, Tuple
 
 logger = logging.getLogger(__name__)
 
+# References to in-flight notification tasks so they are not garbage
+# collected before they finish
+_pending_tasks: Set[asyncio.Task] = set()
+
+
+def _low_stock_message(product_name: str, current_stock: int) -> Tuple[str, str]:
+    """Build the subject and body of a low stock notification."""
+    subject = f"Low Stock Alert: {product_name}"
+    message = (
+        f"The stock level for {product_name} is low. Current stock: {current_stock}"
+    )
+    return subject, message
+
 
 async def send_email_notification(
     email: str,
@@ -22,37 +34,52 @@ async def send_email_notification(
         subject: Email subject
         message: Email message body
     """
-    logger.info(f"Sending email to {email}")
-    logger.info(f"Subject: {subject}")
-    logger.info(f"Message: {message}")
+    logger.info("Sending email to %s", email)
+    logger.info("Subject: %s", subject)
+    logger.info("Message: %s", message)
     # In a real application, you would send the email here
-    logger.info(f"Email sent to {email}")
+    logger.info("Email sent to %s", email)
 
 
-def send_low_stock_notifications(
-    background_tasks: BackgroundTasks,
-    emails: List[str],
+async def notify_low_stock(
+    emails: Sequence[str],
     product_name: str,
     current_stock: int,
 ) -> None:
     """
-    Send low stock notifications to multiple recipients.
+    Send a low stock notification to every recipient.
 
     Args:
-        background_tasks: FastAPI BackgroundTasks
-        emails: List of recipient email addresses
+        emails: Recipient email addresses
         product_name: Name of the product with low stock
         current_stock: Current stock level
     """
-    subject = f"Low Stock Alert: {product_name}"
-    message = (
-        f"The stock level for {product_name} is low. Current stock: {current_stock}"
-    )
+    subject, message = _low_stock_message(product_name, current_stock)
 
     for email in emails:
-        background_tasks.add_task(
-            send_email_notification,
-            email=email,
-            subject=subject,
-            message=message,
-        )
+        await send_email_notification(email=email, subject=subject, message=message)
+
+
+def schedule_low_stock_notifications(
+    emails: Sequence[str],
+    product_name: str,
+    current_stock: int,
+) -> asyncio.Task:
+    """
+    Send low stock notifications in a fire-and-forget task.
+
+    All recipients are handled by a single task on the running event loop,
+    so the request does not wait on them.
+
+    Args:
+        emails: Recipient email addresses
+        product_name: Name of the product with low stock
+        current_stock: Current stock level
+
+    Returns:
+        The scheduled task
+    """
+    task = asyncio.create_task(notify_low_stock(emails, product_name, current_stock))
+    _pending_tasks.add(task)
+    task.add_done_callback(_pending_tasks.discard)
+    return task
@@ -5,6 +5,10 @@ Datetime utilities for handling timezone conversions.
 from datetime import datetime, timezone
 from typing import Optional
 
+# Bound once so the helpers below skip the datetime/timezone attribute lookups
+_UTC = timezone.utc
+_now = datetime.now
+
 
 def to_naive_datetime(dt: datetime) -> datetime:
     """
@@ -35,8 +39,8 @@ def to_utc_datetime(dt: datetime) -> datetime:
     """
     if dt.tzinfo is None:
         # Assume naive datetime is in UTC
-        return dt.replace(tzinfo=timezone.utc)
-    return dt.astimezone(timezone.utc)
+        return dt.replace(tzinfo=_UTC)
+    return dt.astimezone(_UTC)
 
 
 def ensure_naive_for_db(dt: Optional[datetime]) -> Optional[datetime]:
@@ -49,9 +53,10 @@ def ensure_naive_for_db(dt: Optional[datetime]) -> Optional[datetime]:
     Returns:
         Naive datetime or None
     """
-    if dt is None:
-        return None
-    return to_naive_datetime(dt)
+    # Same as to_naive_datetime, inlined to save a call per row
+    if dt is None or dt.tzinfo is None:
+        return dt
+    return dt.replace(tzinfo=None)
 
 
 def now_utc() -> datetime:
@@ -61,7 +66,7 @@ def now_utc() -> datetime:
     Returns:
         Current UTC datetime with timezone info
     """
-    return datetime.now(timezone.utc)
+    return _now(_UTC)
 
 
 def now_naive() -> datetime:
@@ -71,4 +76,4 @@ def now_naive() -> datetime:
     Returns:
         Current datetime without timezone info
     """
-    return datetime.now()
+    return _now()
@@ -1,41 +1,53 @@
 import logging
 import time
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 logger = logging.getLogger("app.middleware")
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
+class RequestLoggingMiddleware:
     """Middleware for logging request information."""
 
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ) -> Response:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process the request and log information."""
-        start_time = time.time()
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        method = request.method
-        path = request.url.path
-        client_host = request.client.host if request.client else "unknown"
+        start_ns = time.monotonic_ns()
 
-        logger.info(f"Request started: {method} {path} from {client_host}")
+        method = scope["method"]
+        path = scope["path"]
+        client = scope.get("client")
+        client_host = client[0] if client else "unknown"
 
-        try:
-            response = await call_next(request)
+        logger.info("Request started: %s %s from %s", method, path, client_host)
 
-            process_time = time.time() - start_time
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Monotonic clock, immune to wall-clock jumps; formatted once
+                # for both the log line and the header
+                process_time = f"{(time.monotonic_ns() - start_ns) / 1e9:.4f}"
 
-            logger.info(
-                f"Request completed: {method} {path} - "
-                f"Status: {response.status_code} - "
-                f"Duration: {process_time:.4f}s"
-            )
+                logger.info(
+                    "Request completed: %s %s - Status: %s - Duration: %ss",
+                    method,
+                    path,
+                    message["status"],
+                    process_time,
+                )
 
-            response.headers["X-Process-Time"] = f"{process_time:.4f}"
-            return response
+                headers = MutableHeaders(scope=message)
+                headers["X-Process-Time"] = process_time
+            await send(message)
 
+        try:
+            await self.app(scope, receive, send_with_timing)
         except Exception as e:
-            logger.error(f"Request failed: {method} {path} - Error: {str(e)}")
+            logger.error("Request failed: %s %s - Error: %s", method, path, e)
             raise
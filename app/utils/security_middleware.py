@@ -3,79 +3,233 @@ Security middleware for production deployment.
 Implements security headers, rate limiting, and other security measures.
 """
 
+import logging
+import math
 import time
-from collections import defaultdict, deque
-from typing import Dict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
-from fastapi import Request, status
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import status
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.settings import get_settings
 
 settings = get_settings()
-
-
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+logger = logging.getLogger("app.middleware")
+
+# Content Security Policy - Allow Swagger UI CDN resources. Kept as bytes, the
+# form it is sent in, so it is never re-encoded
+CONTENT_SECURITY_POLICY = (
+    b"default-src 'self'; "
+    b"script-src 'self' 'unsafe-inline' 'unsafe-eval' https://cdn.jsdelivr.net blob:; "
+    b"worker-src 'self' blob:; "
+    b"style-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net https://fonts.googleapis.com; "
+    b"style-src-elem 'self' 'unsafe-inline' https://cdn.jsdelivr.net https://fonts.googleapis.com; "
+    b"font-src 'self' https://cdn.jsdelivr.net https://fonts.gstatic.com; "
+    b"img-src 'self' data: https:; "
+    b"connect-src 'self' https://api.isms.helevon.org https://isms-ismsbackend-jc2q7s-1afe24-93-127-213-33.traefik.me tauri://localhost; "
+    b"frame-ancestors 'none';"
+)
+
+# ASGI header list entry: lowercase name and value, both latin-1 bytes
+RawHeader = Tuple[bytes, bytes]
+
+
+def _raw_headers(*headers: Tuple[str, str]) -> Tuple[RawHeader, ...]:
+    """Encode header pairs once into the raw form ASGI messages carry."""
+    return tuple(
+        (name.lower().encode("latin-1"), value.encode("latin-1"))
+        for name, value in headers
+    )
+
+
+def _set_raw_headers(message: Message, headers: Sequence[RawHeader]) -> None:
+    """Set headers on a response start message, replacing same-named ones."""
+    names = {name for name, _ in headers}
+    raw = [item for item in message.get("headers", ()) if item[0] not in names]
+    raw.extend(headers)
+    message["headers"] = raw
+
+
+# Headers added to every response when SECURE_HEADERS is on, plus HSTS
+# when HTTPS_ONLY is on; built and encoded once here instead of per response
+SECURITY_HEADERS = _raw_headers(
+    ("X-Content-Type-Options", "nosniff"),
+    ("X-Frame-Options", "DENY"),
+    ("X-XSS-Protection", "1; mode=block"),
+    ("Referrer-Policy", "strict-origin-when-cross-origin"),
+    ("Permissions-Policy", "geolocation=(), microphone=(), camera=()"),
+) + ((b"content-security-policy", CONTENT_SECURITY_POLICY),)
+SECURITY_HEADERS_HSTS = SECURITY_HEADERS + _raw_headers(
+    ("Strict-Transport-Security", "max-age=31536000; includeSubDomains")
+)
+
+
+class SecurityHeadersMiddleware:
     """Add security headers to all responses."""
 
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
-
-        if settings.SECURE_HEADERS:
-            # Security headers
-            response.headers["X-Content-Type-Options"] = "nosniff"
-            response.headers["X-Frame-Options"] = "DENY"
-            response.headers["X-XSS-Protection"] = "1; mode=block"
-            response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-            response.headers["Permissions-Policy"] = (
-                "geolocation=(), microphone=(), camera=()"
-            )
-
-            if settings.HTTPS_ONLY:
-                response.headers["Strict-Transport-Security"] = (
-                    "max-age=31536000; includeSubDomains"
-                )
-
-            # Content Security Policy - Allow Swagger UI CDN resources
-            csp = (
-                "default-src 'self'; "
-                "script-src 'self' 'unsafe-inline' 'unsafe-eval' https://cdn.jsdelivr.net blob:; "
-                "worker-src 'self' blob:; "
-                "style-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net https://fonts.googleapis.com; "
-                "style-src-elem 'self' 'unsafe-inline' https://cdn.jsdelivr.net https://fonts.googleapis.com; "
-                "font-src 'self' https://cdn.jsdelivr.net https://fonts.gstatic.com; "
-                "img-src 'self' data: https:; "
-                "connect-src 'self' https://api.isms.helevon.org https://isms-ismsbackend-jc2q7s-1afe24-93-127-213-33.traefik.me tauri://localhost; "
-                "frame-ancestors 'none';"
-            )
-            response.headers["Content-Security-Policy"] = csp
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
 
-        return response
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start" and settings.SECURE_HEADERS:
+                _set_raw_headers(
+                    message,
+                    SECURITY_HEADERS_HSTS if settings.HTTPS_ONLY else SECURITY_HEADERS,
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+# Health check paths, never rate limited
+RATE_LIMIT_EXEMPT_PATHS = frozenset({"/", "/health", "/api/v1/health"})
+
+# Socket timeouts for the shared limiter's Redis client, in seconds
+REDIS_TIMEOUT = 0.25
+# Seconds to use local counters only after a Redis failure
+REDIS_RETRY_DELAY = 30
+
+# Sliding window counter for the shared limiter, run atomically in Redis.
+# KEYS: current and previous window counters. ARGV: limit, weight of the
+# previous window, key TTL. Returns {limited, requests used}.
+RATE_LIMIT_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+local used = previous * tonumber(ARGV[2]) + current
+if used >= tonumber(ARGV[1]) then
+    return {1, math.ceil(used)}
+end
+if redis.call('INCR', KEYS[1]) == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[3])
+end
+return {0, math.ceil(used + 1)}
+"""
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Rate limiting middleware using sliding window algorithm."""
 
-    def __init__(self, app, requests_per_minute: int = 100, window_size: int = 60):
-        super().__init__(app)
+class RateLimitMiddleware:
+    """
+    Rate limiting middleware using a sliding window counter.
+
+    Each client keeps request counts for the current and previous fixed
+    windows; the previous count is weighted by how much of that window the
+    sliding window still covers. This approximates a true sliding log in
+    constant memory per client.
+
+    Counts are kept per process unless redis_url is given, in which case all
+    workers share counters in Redis (requires the redis package). If Redis
+    fails or times out, the process uses its local counters and leaves Redis
+    alone for REDIS_RETRY_DELAY seconds before trying it again.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        requests_per_minute: int = 100,
+        window_size: int = 60,
+        max_clients: int = 100_000,
+        redis_url: Optional[str] = None,
+    ):
+        self.app = app
         self.requests_per_minute = requests_per_minute
         self.window_size = window_size
-        self.clients: Dict[str, deque] = defaultdict(deque)
-
-    def get_client_ip(self, request: Request) -> str:
+        self.max_clients = max_clients
+        self._limit_header, self._window_header = _raw_headers(
+            ("X-RateLimit-Limit", str(requests_per_minute)),
+            ("X-RateLimit-Window", str(window_size)),
+        )
+        # client_ip -> [window index, current count, previous count]
+        self.clients: Dict[str, List[float]] = {}
+        # Window index of the last sweep for idle clients
+        self._swept_index = 0.0
+
+        self._script = None
+        # Monotonic time before which Redis is skipped after a failure
+        self._redis_retry_at = 0.0
+        if redis_url:
+            try:
+                # Optional dependency, only needed for shared limits
+                from redis.asyncio import Redis
+            except ImportError:
+                raise RuntimeError(
+                    "RATE_LIMIT_REDIS_URL is set but the redis package is not "
+                    "installed; install redis or unset RATE_LIMIT_REDIS_URL"
+                ) from None
+
+            # Short timeouts so an unreachable Redis costs a request a few
+            # hundred milliseconds rather than the OS TCP timeout
+            client = Redis.from_url(
+                redis_url,
+                socket_connect_timeout=REDIS_TIMEOUT,
+                socket_timeout=REDIS_TIMEOUT,
+            )
+            self._script = client.register_script(RATE_LIMIT_SCRIPT)
+
+    def _evict(self, index: float) -> None:
+        """
+        Drop clients idle for two windows, which no longer affect any limit.
+
+        Runs once per window. If a single window alone brings in more than
+        max_clients clients, the oldest entries are dropped as well.
+        """
+        if index != self._swept_index:
+            self._swept_index = index
+            self.clients = {
+                ip: counter
+                for ip, counter in self.clients.items()
+                if counter[0] >= index - 1
+            }
+
+        clients = self.clients
+        while len(clients) >= self.max_clients:
+            del clients[next(iter(clients))]
+
+    @staticmethod
+    def get_client_ip(scope: Scope) -> str:
         """Get client IP address."""
-        # Check for forwarded headers (common in reverse proxy setups)
-        forwarded_for = request.headers.get("X-Forwarded-For")
+        # Check for forwarded headers (common in reverse proxy setups), in one
+        # pass over the raw header list
+        forwarded_for = real_ip = None
+        for name, value in scope["headers"]:
+            if name == b"x-forwarded-for":
+                if forwarded_for is None:
+                    forwarded_for = value
+            elif name == b"x-real-ip" and real_ip is None:
+                real_ip = value
+
         if forwarded_for:
-            return forwarded_for.split(",")[0].strip()
+            # The first hop is the original client
+            comma = forwarded_for.find(b",")
+            if comma >= 0:
+                forwarded_for = forwarded_for[:comma]
+            return forwarded_for.strip().decode("latin-1")
 
-        real_ip = request.headers.get("X-Real-IP")
         if real_ip:
-            return real_ip
+            return real_ip.decode("latin-1")
 
         # Fallback to direct client IP
-        return request.client.host if request.client else "unknown"
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    def _used(self, client_ip: str, now: float) -> float:
+        """Estimate the requests client_ip made in the window ending at now."""
+        counter = self.clients.get(client_ip)
+        if counter is None:
+            return 0.0
+
+        index, offset = divmod(now, self.window_size)
+        overlap = 1 - offset / self.window_size
+        if counter[0] == index:
+            return counter[2] * overlap + counter[1]
+        if counter[0] == index - 1:
+            # The stored current window is now the previous one
+            return counter[1] * overlap
+        return 0.0
 
     def is_rate_limited(self, client_ip: str) -> bool:
         """Check if client is rate limited."""
@@ -83,29 +237,84 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             return False
 
         now = time.time()
-        client_requests = self.clients[client_ip]
-
-        # Remove old requests outside the window
-        while client_requests and client_requests[0] <= now - self.window_size:
-            client_requests.popleft()
-
-        # Check if limit exceeded
-        if len(client_requests) >= self.requests_per_minute:
+        if self._used(client_ip, now) >= self.requests_per_minute:
             return True
 
-        # Add current request
-        client_requests.append(now)
+        # Count the current request, rolling the windows forward if needed
+        index = now // self.window_size
+        counter = self.clients.get(client_ip)
+        if counter is None:
+            self._evict(index)
+            self.clients[client_ip] = [index, 1, 0]
+        elif counter[0] < index - 1:
+            counter[:] = [index, 1, 0]
+        elif counter[0] != index:
+            counter[:] = [index, 1, counter[1]]
+        else:
+            counter[1] += 1
         return False
 
-    async def dispatch(self, request: Request, call_next):
-        client_ip = self.get_client_ip(request)
+    def remaining(self, client_ip: str) -> int:
+        """Requests client_ip may still make in the current window."""
+        used = math.ceil(self._used(client_ip, time.time()))
+        return max(0, self.requests_per_minute - used)
+
+    async def _check_shared(self, client_ip: str) -> Tuple[bool, int]:
+        """Count a request against the counters shared in Redis."""
+        index, offset = divmod(time.time(), self.window_size)
+        index = int(index)
+        limited, used = await self._script(
+            keys=[
+                f"ratelimit:{client_ip}:{index}",
+                f"ratelimit:{client_ip}:{index - 1}",
+            ],
+            args=[
+                self.requests_per_minute,
+                1 - offset / self.window_size,
+                self.window_size * 2,
+            ],
+        )
+        return bool(limited), max(0, self.requests_per_minute - used)
+
+    async def check(self, client_ip: str) -> Tuple[bool, int]:
+        """
+        Count a request from client_ip.
+
+        Returns:
+            Whether the client is rate limited, and its remaining requests
+        """
+        if (
+            self._script is not None
+            and settings.RATE_LIMIT_ENABLED
+            and time.monotonic() >= self._redis_retry_at
+        ):
+            try:
+                return await self._check_shared(client_ip)
+            except Exception as e:
+                self._redis_retry_at = time.monotonic() + REDIS_RETRY_DELAY
+                logger.warning(
+                    "Shared rate limit check failed, using local limits for %ss: %s",
+                    REDIS_RETRY_DELAY,
+                    e,
+                )
+
+        return self.is_rate_limited(client_ip), self.remaining(client_ip)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
         # Skip rate limiting for health checks
-        if request.url.path in ["/", "/health", "/api/v1/health"]:
-            return await call_next(request)
+        if scope["path"] in RATE_LIMIT_EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
 
-        if self.is_rate_limited(client_ip):
-            return JSONResponse(
+        client_ip = self.get_client_ip(scope)
+
+        limited, remaining = await self.check(client_ip)
+        if limited:
+            response = JSONResponse(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                 content={
                     "detail": "Rate limit exceeded. Please try again later.",
@@ -117,30 +326,79 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                     "X-RateLimit-Window": str(self.window_size),
                 },
             )
+            await response(scope, receive, send)
+            return
+
+        async def send_with_limits(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Add rate limit headers to response
+                _set_raw_headers(
+                    message,
+                    (
+                        self._limit_header,
+                        (b"x-ratelimit-remaining", str(remaining).encode("latin-1")),
+                        self._window_header,
+                    ),
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_limits)
 
-        response = await call_next(request)
 
-        # Add rate limit headers to response
-        client_requests = self.clients[client_ip]
-        remaining = max(0, self.requests_per_minute - len(client_requests))
+VARY_HEADER = _raw_headers(("Vary", "Accept-Encoding"))
 
-        response.headers["X-RateLimit-Limit"] = str(self.requests_per_minute)
-        response.headers["X-RateLimit-Remaining"] = str(remaining)
-        response.headers["X-RateLimit-Window"] = str(self.window_size)
 
-        return response
+class CompressionMiddleware:
+    """
+    Simple compression middleware for JSON responses.
 
+    Responses with a Content-Length below minimum_size are left alone;
+    compressing sub-kilobyte bodies costs CPU without saving bandwidth.
+    """
 
-class CompressionMiddleware(BaseHTTPMiddleware):
-    """Simple compression middleware for JSON responses."""
+    def __init__(self, app: ASGIApp, minimum_size: int = 0):
+        self.app = app
+        self.minimum_size = minimum_size
 
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        # Add compression hint for reverse proxy
-        if "application/json" in response.headers.get(
-            "content-type", ""
-        ) and "gzip" in request.headers.get("accept-encoding", ""):
-            response.headers["Vary"] = "Accept-Encoding"
+        if not self.accepts_gzip(scope):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_vary(message: Message) -> None:
+            if message["type"] == "http.response.start" and self.is_eligible(
+                message.get("headers", ())
+            ):
+                # Add compression hint for reverse proxy
+                _set_raw_headers(message, VARY_HEADER)
+            await send(message)
+
+        await self.app(scope, receive, send_with_vary)
+
+    @staticmethod
+    def accepts_gzip(scope: Scope) -> bool:
+        """Check the request's Accept-Encoding for gzip, on the raw bytes."""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                return b"gzip" in value
+        return False
+
+    def is_eligible(self, headers: Iterable[RawHeader]) -> bool:
+        """Check whether a response is JSON and large enough to compress."""
+        content_type = content_length = None
+        for name, value in headers:
+            if name == b"content-type":
+                if content_type is None:
+                    content_type = value
+            elif name == b"content-length" and content_length is None:
+                content_length = value
+
+        if content_type is None or b"application/json" not in content_type:
+            return False
 
-        return response
+        # Streaming responses have no length and are always eligible
+        return content_length is None or int(content_length) >= self.minimum_size
@@ -348,3 +348,21 @@ async def test_token_expiration_flow(
         headers={"Authorization": f"Bearer {token}"},
     )
     assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_login_nonexistent_user_still_verifies_hash(
+    client: AsyncClient,
+    test_user: User,
+):
+    """Test that login runs a hash check even when the email is unknown."""
+    from unittest.mock import patch
+
+    with patch("app.api.v1.auth.verify_password", return_value=False) as mock_verify:
+        response = await client.post(
+            f"{settings.API_V1_STR}/auth/login",
+            data={"username": "nobody@example.com", "password": "password123"},
+        )
+
+    assert response.status_code == 401
+    mock_verify.assert_called_once()
@@ -127,3 +127,64 @@ async def test_metrics_disabled(client: AsyncClient):
     assert response.status_code == 404
     data = response.json()
     assert "Metrics endpoint is disabled" in data["detail"]
+
+
+@pytest.mark.api
+def test_system_snapshot_served_from_cache():
+    """Test that system metrics are read from the sampler cache."""
+    from unittest.mock import patch
+
+    from app.api.v1 import health
+
+    cached = {
+        "memory": {"total_gb": 1.0, "available_gb": 0.5, "percent_used": 50.0},
+        "disk": {
+            "total_gb": 10.0,
+            "free_gb": 5.0,
+            "percent_used": 50.0,
+            "percent": 50.0,
+        },
+        "cpu_percent": 12.5,
+    }
+
+    with (
+        patch.dict(health._SYSTEM_CACHE, {"ts": 1.0, "data": cached}),
+        patch.object(health.psutil, "virtual_memory") as mock_memory,
+    ):
+        assert health.get_system_snapshot() is cached
+        mock_memory.assert_not_called()
+
+
+@pytest.mark.api
+@pytest.mark.asyncio
+async def test_user_count_cached(db: AsyncSession):
+    """Test that the users count is cached between health checks."""
+    from unittest.mock import patch
+
+    from app.api.v1 import health
+
+    with patch.dict(health._USER_COUNT_CACHE, {"ts": 0.0, "data": None}):
+        assert await health._get_user_count(db) == 0
+
+        with patch.object(db, "execute") as mock_execute:
+            assert await health._get_user_count(db) == 0
+            mock_execute.assert_not_called()
+
+
+@pytest.mark.api
+@pytest.mark.asyncio
+async def test_readiness_check_cached(client: AsyncClient, db: AsyncSession):
+    """Test that a recent successful readiness check skips the database."""
+    from unittest.mock import patch
+
+    from app.api.v1 import health
+
+    with patch.dict(health._READY_CACHE, {"ts": 0.0}):
+        response = await client.get("/health/readiness")
+        assert response.status_code == 200
+        assert health._READY_CACHE["ts"] > 0
+
+        with patch.object(AsyncSession, "execute") as mock_execute:
+            response = await client.get("/health/readiness")
+            assert response.status_code == 200
+            mock_execute.assert_not_called()
@@ -1,11 +1,14 @@
+from typing import get_args
+
 import pytest
 import pytest_asyncio
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.settings import get_settings
-from app.models.inventory import Product, ProductCategory, Supplier
+from app.models.inventory import MovementType, Product, ProductCategory, Supplier
 from app.models.user import User, UserRole
+from app.schemas.inventory import MovementTypeValue, ProductCategoryValue
 
 settings = get_settings()
 
@@ -125,6 +128,46 @@ async def test_get_products_pagination(
     )
     assert response.status_code == 200
 
+    # Limits above the page size cap are rejected
+    response = await client.get(
+        f"{settings.API_V1_STR}/inventory/products?limit={settings.MAX_PAGE_SIZE + 1}",
+        headers=headers,
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_get_products_keyset_pagination(
+    client: AsyncClient,
+    test_user: User,
+    db: AsyncSession,
+):
+    """Test products keyset pagination with after_id."""
+    for i in range(3):
+        db.add(Product(name=f"Keyset {i}", sku=f"KEYSET{i}", price=1.0, cost=0.5))
+    await db.commit()
+
+    headers = await get_auth_headers(client, test_user)
+
+    response = await client.get(
+        f"{settings.API_V1_STR}/inventory/products?limit=2",
+        headers=headers,
+    )
+    assert response.status_code == 200
+    first_page = response.json()
+    assert len(first_page) == 2
+    next_after_id = response.headers["X-Next-After-Id"]
+    assert next_after_id == str(first_page[-1]["id"])
+
+    response = await client.get(
+        f"{settings.API_V1_STR}/inventory/products?limit=2&after_id={next_after_id}",
+        headers=headers,
+    )
+    assert response.status_code == 200
+    second_page = response.json()
+    assert [product["sku"] for product in second_page] == ["KEYSET2"]
+    assert "X-Next-After-Id" not in response.headers
+
 
 @pytest.mark.asyncio
 async def test_get_products_unauthorized(
@@ -231,6 +274,45 @@ async def test_create_product_insufficient_permissions(
     assert response.status_code == 403
 
 
+@pytest.mark.asyncio
+async def test_create_product_custom_role(
+    client: AsyncClient,
+    db: AsyncSession,
+    test_supplier: Supplier,
+):
+    """Test that custom roles, unlike cashiers, can create products."""
+    clerk = await User.create(
+        db,
+        obj_in={
+            "email": "clerk@example.com",
+            "password": "password123",
+            "full_name": "Stock Clerk",
+            "role": "stock_clerk",
+        },
+    )
+    headers = await get_auth_headers(client, clerk)
+
+    product_data = {
+        "name": "Clerk Product",
+        "description": "Created by a custom role",
+        "sku": "CLERK001",
+        "category": "grocery",
+        "price": 3.50,
+        "cost": 1.75,
+        "quantity": 20,
+        "reorder_level": 5,
+        "supplier_id": test_supplier.id,
+    }
+
+    response = await client.post(
+        f"{settings.API_V1_STR}/inventory/products",
+        json=product_data,
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert response.json()["sku"] == "CLERK001"
+
+
 @pytest.mark.asyncio
 async def test_get_product_by_id_success(
     client: AsyncClient,
@@ -580,3 +662,9 @@ async def test_negative_stock_handling(
     )
     # Should handle gracefully (either reject or allow negative stock based on business rules)
     assert response.status_code in [200, 400]
+
+
+def test_inventory_response_literals_match_enums():
+    """Test the response Literal aliases list every enum value."""
+    assert set(get_args(ProductCategoryValue)) == {c.value for c in ProductCategory}
+    assert set(get_args(MovementTypeValue)) == {t.value for t in MovementType}
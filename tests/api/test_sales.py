@@ -1,14 +1,18 @@
 from datetime import datetime, timedelta, timezone
+from typing import get_args
 
+import orjson
 import pytest
 import pytest_asyncio
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.v1.sales import build_order_response, serialize_order
 from app.core.settings import get_settings
 from app.models.inventory import Product, ProductCategory
 from app.models.sales import Order, OrderItem, OrderStatus, PaymentMethod
 from app.models.user import User, UserRole
+from app.schemas.sales import OrderStatusValue, PaymentMethodValue
 
 settings = get_settings()
 
@@ -121,6 +125,8 @@ async def test_create_order_success(
     assert data["status"] == "pending"
     assert "id" in data
     assert len(data["items"]) == 1
+    assert data["items"][0]["order_id"] == data["id"]
+    assert data["total_amount"] == pytest.approx(2 * test_product.price)
 
 
 @pytest.mark.asyncio
@@ -202,6 +208,8 @@ async def test_get_orders_success(
     order = data[0]
     assert order["customer_name"] == test_order.customer_name
     assert order["status"] == test_order.status.value
+    assert len(order["items"]) == 1
+    assert order["items"][0]["quantity"] == 2
 
 
 @pytest.mark.asyncio
@@ -230,6 +238,46 @@ async def test_get_orders_pagination(
     assert response.status_code == 200
 
 
+@pytest.mark.asyncio
+async def test_get_orders_cursor_pagination(
+    client: AsyncClient,
+    test_user: User,
+    db: AsyncSession,
+):
+    """Test orders keyset pagination with an opaque cursor."""
+    for i in range(3):
+        db.add(Order(customer_name=f"Cursor {i}", cashier_id=test_user.id))
+    await db.commit()
+
+    headers = await get_auth_headers(client, test_user)
+
+    response = await client.get(
+        f"{settings.API_V1_STR}/sales/orders?limit=2",
+        headers=headers,
+    )
+    assert response.status_code == 200
+    first_page = response.json()
+    assert [order["customer_name"] for order in first_page] == [
+        "Cursor 2",
+        "Cursor 1",
+    ]
+    cursor = response.headers["X-Next-Cursor"]
+
+    response = await client.get(
+        f"{settings.API_V1_STR}/sales/orders?limit=2&cursor={cursor}",
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert [order["customer_name"] for order in response.json()] == ["Cursor 0"]
+    assert "X-Next-Cursor" not in response.headers
+
+    response = await client.get(
+        f"{settings.API_V1_STR}/sales/orders?cursor=not-a-cursor",
+        headers=headers,
+    )
+    assert response.status_code == 400
+
+
 @pytest.mark.asyncio
 async def test_get_order_by_id_success(
     client: AsyncClient,
@@ -653,3 +701,26 @@ async def test_order_lifecycle_complete_flow(
         headers=headers,
     )
     assert response.status_code == 400
+
+
+def test_serialize_order_matches_order_response():
+    """Test that listing serialization matches the OrderResponse schema."""
+    order = Order(
+        id=3,
+        customer_name="Serialized Customer",
+        payment_method=PaymentMethod.CREDIT_CARD,
+        status=OrderStatus.COMPLETED,
+        cashier_id=7,
+        total_amount=2.5,
+        created_at=datetime(2024, 1, 2, 3, 4, 5, 600),
+    )
+    items = [OrderItem(id=1, order_id=3, product_id=4, quantity=2, unit_price=1.25)]
+
+    expected = build_order_response(order, items).model_dump(mode="json")
+    assert orjson.loads(orjson.dumps(serialize_order(order, items))) == expected
+
+
+def test_order_response_literals_match_enums():
+    """Test the response Literal aliases list every enum value."""
+    assert set(get_args(PaymentMethodValue)) == {m.value for m in PaymentMethod}
+    assert set(get_args(OrderStatusValue)) == {s.value for s in OrderStatus}
@@ -212,6 +212,33 @@ async def test_update_user(
     assert response.status_code == status.HTTP_404_NOT_FOUND
 
 
+@pytest.mark.asyncio
+async def test_update_user_password(
+    client: AsyncClient,
+    test_user: User,
+):
+    """Test updating a user's password together with other fields."""
+    login_response = await client.post(
+        f"{settings.API_V1_STR}/auth/login",
+        data={"username": test_user.email, "password": "password123"},
+    )
+    user_token = login_response.json()["access_token"]
+
+    response = await client.put(
+        f"{settings.API_V1_STR}/users/{test_user.id}",
+        headers={"Authorization": f"Bearer {user_token}"},
+        json={"full_name": "Renamed User", "password": "newpassword123"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["full_name"] == "Renamed User"
+
+    login_response = await client.post(
+        f"{settings.API_V1_STR}/auth/login",
+        data={"username": test_user.email, "password": "newpassword123"},
+    )
+    assert login_response.status_code == status.HTTP_200_OK
+
+
 @pytest.mark.asyncio
 async def test_delete_user(
     client: AsyncClient,
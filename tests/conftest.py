@@ -6,8 +6,7 @@ import pytest_asyncio
 from fastapi import FastAPI
 from httpx import AsyncClient
 from httpx._transports.asgi import ASGITransport
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlmodel import SQLModel
 
 # Set test environment
@@ -30,8 +29,8 @@ test_engine = create_async_engine(
 )
 
 # Create test session factory
-test_async_session_factory = sessionmaker(
-    test_engine, class_=AsyncSession, expire_on_commit=False
+test_async_session_factory = async_sessionmaker(
+    test_engine, class_=AsyncSession, expire_on_commit=False, autoflush=False
 )
 
 
@@ -52,6 +51,9 @@ async def db() -> AsyncGenerator[AsyncSession, None]:
     async with test_engine.begin() as conn:
         await conn.run_sync(SQLModel.metadata.drop_all)
 
+    # IDs are reused by the next test's fresh database
+    User.invalidate_cache()
+
 
 @pytest.fixture
 def app() -> FastAPI:
@@ -1,4 +1,4 @@
-from unittest.mock import patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from sqlalchemy import text
@@ -193,3 +193,32 @@ def test_database_settings_validation():
     # In normal environment, it would be the file-based database
     assert settings.SQLITE_DATABASE_URI is not None
     assert "sqlite+aiosqlite://" in settings.SQLITE_DATABASE_URI
+
+
+@pytest.mark.asyncio
+async def test_warm_up_pool_skips_sqlite():
+    """Test that pool warm-up is a no-op outside PostgreSQL."""
+    from app.core.database import warm_up_pool
+
+    with patch("app.core.database.engine") as mock_engine:
+        mock_engine.dialect.name = "sqlite"
+        await warm_up_pool()
+
+    mock_engine.connect.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_warm_up_pool_opens_pool_size_connections():
+    """Test that pool warm-up opens and returns POOL_SIZE connections."""
+    from sqlalchemy.ext.asyncio import AsyncConnection
+
+    from app.core.database import settings, warm_up_pool
+
+    conn = MagicMock(spec=AsyncConnection)
+    with patch("app.core.database.engine") as mock_engine:
+        mock_engine.dialect.name = "postgresql"
+        mock_engine.connect.return_value.start = AsyncMock(return_value=conn)
+        await warm_up_pool()
+
+    assert mock_engine.connect.call_count == settings.POOL_SIZE
+    assert conn.close.await_count == settings.POOL_SIZE
@@ -0,0 +1,65 @@
+import logging
+import os
+from logging.handlers import QueueHandler
+
+import pytest
+
+from app.core import logging as app_logging
+
+
+@pytest.mark.core
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_log_listener_restarted_after_fork(tmp_path):
+    """Test that records logged in a forked child reach the file handler."""
+    log_file = tmp_path / "fork.log"
+    app_logging._start_log_listener(logging.INFO, log_file)
+
+    logger = logging.getLogger("tests.logging.fork")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    handler = QueueHandler(app_logging._log_queue)
+    logger.addHandler(handler)
+
+    try:
+        pid = os.fork()
+        if pid == 0:
+            # Child: log, then flush through the listener before exiting
+            try:
+                logger.info("logged from the child")
+                app_logging._stop_log_listener()
+            finally:
+                os._exit(0)
+
+        os.waitpid(pid, 0)
+        assert "logged from the child" in log_file.read_text()
+    finally:
+        logger.removeHandler(handler)
+        app_logging._start_log_listener(logging.INFO)
+
+
+@pytest.mark.core
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_console_logging_after_fork(capfd):
+    """Test that records logged in a forked child reach the console."""
+    app_logging._start_log_listener(logging.INFO)
+
+    logger = logging.getLogger("tests.logging.console")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    handler = QueueHandler(app_logging._log_queue)
+    logger.addHandler(handler)
+
+    try:
+        pid = os.fork()
+        if pid == 0:
+            try:
+                logger.info("console from the child")
+                app_logging._stop_log_listener()
+            finally:
+                os._exit(0)
+
+        os.waitpid(pid, 0)
+        assert "console from the child" in capfd.readouterr().out
+    finally:
+        logger.removeHandler(handler)
+        app_logging._start_log_listener(logging.INFO)
@@ -1,4 +1,12 @@
-from app.core.permissions import PermissionRegistry
+import pytest
+from fastapi import HTTPException
+
+from app.core.permissions import (
+    PermissionRegistry,
+    exclude_roles,
+    require_permission,
+    require_roles,
+)
 from app.models.user import User, UserRole
 
 
@@ -78,6 +86,43 @@ def test_has_permission():
     assert not PermissionRegistry.has_permission(cashier_user, test_permission)
 
 
+def test_role_permissions_are_frozen():
+    """Test that role permission sets are immutable and shared."""
+    permissions = PermissionRegistry.get_role_permissions(UserRole.MANAGER.value)
+    assert isinstance(permissions, frozenset)
+    assert permissions is PermissionRegistry.get_role_permissions(UserRole.MANAGER)
+
+    unknown = PermissionRegistry.get_role_permissions("unknown_role")
+    assert unknown == frozenset()
+    assert unknown is PermissionRegistry.get_role_permissions("other_unknown_role")
+
+
+def test_has_permission_cache_invalidated():
+    """Test that memoized permission checks follow registry changes."""
+    custom_role = "test_cached_role"
+    perm1 = "test:cached_perm1"
+    perm2 = "test:cached_perm2"
+    PermissionRegistry.register_permission(perm1)
+    PermissionRegistry.register_permission(perm2)
+    PermissionRegistry.register_custom_role(custom_role, {perm1})
+
+    user = User(
+        email="cached@example.com",
+        hashed_password="",
+        full_name="Cached",
+        role=custom_role,
+    )
+
+    assert not PermissionRegistry.has_permission(user, perm2)
+    assert (custom_role, perm2) in PermissionRegistry._permission_cache
+
+    PermissionRegistry.register_custom_role(custom_role, {perm1, perm2})
+    assert PermissionRegistry.has_permission(user, perm2)
+
+    PermissionRegistry.remove_custom_role(custom_role)
+    assert not PermissionRegistry.has_permission(user, perm1)
+
+
 def test_custom_role_permissions():
     """Test custom role permissions."""
     # Register test permissions
@@ -109,3 +154,82 @@ def test_custom_role_permissions():
     # Check permissions again
     assert PermissionRegistry.has_permission(custom_user, perm1)
     assert PermissionRegistry.has_permission(custom_user, perm2)
+
+
+@pytest.mark.asyncio
+async def test_require_roles():
+    """Test the require_roles dependency."""
+    dependency = require_roles(UserRole.ADMIN, UserRole.MANAGER)
+
+    manager_user = User(
+        id=5,
+        email="manager_roles@example.com",
+        hashed_password="",
+        full_name="Manager",
+        role=UserRole.MANAGER.value,
+    )
+    cashier_user = User(
+        id=6,
+        email="cashier_roles@example.com",
+        hashed_password="",
+        full_name="Cashier",
+        role=UserRole.CASHIER.value,
+    )
+
+    assert await dependency(manager_user) is manager_user
+
+    with pytest.raises(HTTPException) as exc_info:
+        await dependency(cashier_user)
+    assert exc_info.value.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_require_permission_dependency_reused():
+    """Test that require_permission returns one dependency per permission."""
+    permission = "test:require_reused"
+    PermissionRegistry.register_permission(permission, [UserRole.MANAGER])
+
+    dependency = require_permission(permission)
+    assert require_permission(permission) is dependency
+
+    manager_user = User(
+        email="manager_reused@example.com",
+        hashed_password="",
+        full_name="Manager",
+        role=UserRole.MANAGER.value,
+    )
+    cashier_user = User(
+        email="cashier_reused@example.com",
+        hashed_password="",
+        full_name="Cashier",
+        role=UserRole.CASHIER.value,
+    )
+
+    assert await dependency(manager_user) is manager_user
+    with pytest.raises(HTTPException):
+        await dependency(cashier_user)
+
+
+@pytest.mark.asyncio
+async def test_exclude_roles():
+    """Test the exclude_roles dependency."""
+    dependency = exclude_roles(UserRole.CASHIER)
+
+    cashier_user = User(
+        email="cashier_excluded@example.com",
+        hashed_password="",
+        full_name="Cashier",
+        role=UserRole.CASHIER.value,
+    )
+    custom_user = User(
+        email="custom_excluded@example.com",
+        hashed_password="",
+        full_name="Custom",
+        role="test_custom_excluded",
+    )
+
+    assert await dependency(custom_user) is custom_user
+
+    with pytest.raises(HTTPException) as exc_info:
+        await dependency(cashier_user)
+    assert exc_info.value.status_code == 403
@@ -1,4 +1,5 @@
 from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
 
 import pytest
 from fastapi import HTTPException
@@ -94,6 +95,31 @@ async def test_get_current_user_valid_token(db: AsyncSession):
     assert current_user.email == test_user.email
 
 
+@pytest.mark.asyncio
+async def test_get_current_user_reuses_decoded_token(db: AsyncSession):
+    """Test that a repeated token is verified only once."""
+    test_user = User(
+        email="test_token_cache@example.com",
+        hashed_password=get_password_hash("testpassword"),
+        full_name="Test Token Cache User",
+        role=UserRole.CASHIER.value,
+        is_active=True,
+    )
+
+    db.add(test_user)
+    await db.commit()
+    await db.refresh(test_user)
+
+    token = create_access_token(test_user.id, expires_delta=timedelta(minutes=7))
+
+    with patch("app.core.security.jwt.decode", wraps=jwt.decode) as mock_decode:
+        first = await get_current_user(db, token)
+        second = await get_current_user(db, token)
+
+    assert first.id == second.id == test_user.id
+    assert mock_decode.call_count == 1
+
+
 @pytest.mark.asyncio
 async def test_get_current_user_invalid_token(db: AsyncSession):
     """Test get_current_user with invalid token."""
@@ -238,6 +264,17 @@ async def test_get_current_user_malformed_token(db: AsyncSession):
     assert "Could not validate credentials" in exc_info.value.detail
 
 
+@pytest.mark.asyncio
+async def test_get_current_user_token_without_exp(db: AsyncSession):
+    """Test that a signed token without an exp claim is rejected."""
+    token = jwt.encode({"sub": "1"}, settings.SECRET_KEY, algorithm="HS256")
+
+    with pytest.raises(HTTPException) as exc_info:
+        await get_current_user(db, token)
+
+    assert exc_info.value.status_code == 401
+
+
 def test_create_access_token_with_string_subject():
     """Test creating access token with string subject."""
     # Test with string subject
@@ -2,15 +2,16 @@
 Tests for security middleware.
 """
 
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 import pytest
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from httpx import AsyncClient
 from httpx._transports.asgi import ASGITransport
 
 from app.core.settings import get_settings
 from app.utils.security_middleware import (
+    CONTENT_SECURITY_POLICY,
     CompressionMiddleware,
     RateLimitMiddleware,
     SecurityHeadersMiddleware,
@@ -52,6 +53,9 @@ async def test_security_headers_middleware_directly():
             assert "Permissions-Policy" in response.headers
             assert "Strict-Transport-Security" in response.headers
             assert "Content-Security-Policy" in response.headers
+            assert response.headers["Content-Security-Policy"] == (
+                CONTENT_SECURITY_POLICY.decode()
+            )
 
 
 @pytest.mark.core
@@ -256,29 +260,27 @@ def test_rate_limit_get_client_ip():
     app = FastAPI()
     middleware = RateLimitMiddleware(app)
 
-    # Mock request with X-Forwarded-For header
-    class MockClient:
-        host = "127.0.0.1"
-
-    class MockRequest:
-        def __init__(self, headers=None, client=None):
-            self.headers = headers or {}
-            self.client = client
+    def scope(headers=(), client=None):
+        return {"type": "http", "headers": list(headers), "client": client}
 
     # Test X-Forwarded-For header
-    request = MockRequest(headers={"X-Forwarded-For": "192.168.1.1, 10.0.0.1"})
+    request = scope(headers=[(b"x-forwarded-for", b"192.168.1.1, 10.0.0.1")])
     assert middleware.get_client_ip(request) == "192.168.1.1"
 
+    # Test X-Forwarded-For header with a single hop
+    request = scope(headers=[(b"x-forwarded-for", b" 192.168.1.3 ")])
+    assert middleware.get_client_ip(request) == "192.168.1.3"
+
     # Test X-Real-IP header
-    request = MockRequest(headers={"X-Real-IP": "192.168.1.2"})
+    request = scope(headers=[(b"x-real-ip", b"192.168.1.2")])
     assert middleware.get_client_ip(request) == "192.168.1.2"
 
     # Test fallback to client.host
-    request = MockRequest(client=MockClient())
+    request = scope(client=("127.0.0.1", 50000))
     assert middleware.get_client_ip(request) == "127.0.0.1"
 
     # Test no client
-    request = MockRequest()
+    request = scope()
     assert middleware.get_client_ip(request) == "unknown"
 
 
@@ -303,3 +305,155 @@ async def test_compression_middleware_no_gzip():
 
         # Vary header should not be set when gzip is not in accept-encoding
         assert "Vary" not in response.headers
+
+
+@pytest.mark.core
+@pytest.mark.asyncio
+async def test_compression_middleware_minimum_size():
+    """Test that responses below minimum_size get no compression hint."""
+    app = FastAPI()
+
+    @app.get("/small")
+    async def small_endpoint():
+        return {"message": "test"}
+
+    @app.get("/large")
+    async def large_endpoint():
+        return {"message": "x" * 2048}
+
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        small = await client.get("/small", headers={"Accept-Encoding": "gzip"})
+        large = await client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+    assert "Vary" not in small.headers
+    assert large.headers["Vary"] == "Accept-Encoding"
+
+
+@pytest.mark.core
+def test_rate_limit_sliding_window_counter():
+    """Test that the previous window's count decays across the next window."""
+    middleware = RateLimitMiddleware(FastAPI(), requests_per_minute=4, window_size=60)
+
+    with (
+        patch.object(settings, "RATE_LIMIT_ENABLED", True),
+        patch("app.utils.security_middleware.time.time") as mock_time,
+    ):
+        # Fill the window ending at t=120
+        mock_time.return_value = 110.0
+        for _ in range(4):
+            assert not middleware.is_rate_limited("1.2.3.4")
+        assert middleware.is_rate_limited("1.2.3.4")
+        assert middleware.remaining("1.2.3.4") == 0
+
+        # A quarter into the next window, 3 of the 4 previous requests count
+        mock_time.return_value = 135.0
+        assert middleware.remaining("1.2.3.4") == 1
+        assert not middleware.is_rate_limited("1.2.3.4")
+        assert middleware.is_rate_limited("1.2.3.4")
+
+        # Two windows later the client starts fresh
+        mock_time.return_value = 250.0
+        assert middleware.remaining("1.2.3.4") == 4
+        assert not middleware.is_rate_limited("1.2.3.4")
+        assert middleware.clients["1.2.3.4"] == [4, 1, 0]
+
+
+@pytest.mark.core
+def test_rate_limit_evicts_idle_clients():
+    """Test that idle clients are dropped and the client map stays bounded."""
+    middleware = RateLimitMiddleware(FastAPI(), requests_per_minute=5, max_clients=3)
+
+    with (
+        patch.object(settings, "RATE_LIMIT_ENABLED", True),
+        patch("app.utils.security_middleware.time.time") as mock_time,
+    ):
+        mock_time.return_value = 10.0
+        middleware.is_rate_limited("10.0.0.1")
+        middleware.is_rate_limited("10.0.0.2")
+
+        # The next window still needs the previous counts
+        mock_time.return_value = 70.0
+        middleware.is_rate_limited("10.0.0.3")
+        assert set(middleware.clients) == {"10.0.0.1", "10.0.0.2", "10.0.0.3"}
+
+        # A full-map insert drops the oldest entry
+        middleware.is_rate_limited("10.0.0.4")
+        assert set(middleware.clients) == {"10.0.0.2", "10.0.0.3", "10.0.0.4"}
+
+        # Two windows after their last request, idle clients are swept
+        mock_time.return_value = 190.0
+        middleware.is_rate_limited("10.0.0.5")
+        assert set(middleware.clients) == {"10.0.0.5"}
+
+
+@pytest.mark.core
+@pytest.mark.asyncio
+async def test_rate_limit_shared_counters():
+    """Test that a configured shared limiter decides, with local fallback."""
+    middleware = RateLimitMiddleware(FastAPI(), requests_per_minute=3)
+    middleware._script = AsyncMock(return_value=[0, 1])
+
+    with patch.object(settings, "RATE_LIMIT_ENABLED", True):
+        assert await middleware.check("10.0.0.1") == (False, 2)
+        keys = middleware._script.call_args.kwargs["keys"]
+        assert keys[0].startswith("ratelimit:10.0.0.1:")
+
+        middleware._script.return_value = [1, 3]
+        assert await middleware.check("10.0.0.1") == (True, 0)
+        assert middleware.clients == {}
+
+        # Redis errors fall back to the per-process counters
+        middleware._script.side_effect = ConnectionError("redis down")
+        assert await middleware.check("10.0.0.1") == (False, 2)
+        assert "10.0.0.1" in middleware.clients
+
+        # ...and Redis is left alone until the retry delay has passed
+        middleware._script.side_effect = None
+        middleware._script.reset_mock()
+        assert await middleware.check("10.0.0.1") == (False, 1)
+        middleware._script.assert_not_called()
+
+        middleware._redis_retry_at = 0.0
+        assert await middleware.check("10.0.0.1") == (True, 0)
+        middleware._script.assert_awaited_once()
+
+
+@pytest.mark.core
+def test_rate_limit_redis_url_without_redis_package():
+    """Test that a Redis URL without the redis package is a clear error."""
+    with patch.dict("sys.modules", {"redis.asyncio": None}):
+        with pytest.raises(RuntimeError, match="redis package is not installed"):
+            RateLimitMiddleware(FastAPI(), redis_url="redis://localhost:6379/0")
+
+
+@pytest.mark.core
+@pytest.mark.asyncio
+async def test_security_headers_replace_existing():
+    """Test that security headers override values set by the endpoint."""
+    app = FastAPI()
+
+    @app.get("/test")
+    async def test_endpoint(response: Response):
+        response.headers["X-Frame-Options"] = "SAMEORIGIN"
+        response.headers["Strict-Transport-Security"] = "max-age=60"
+        return {"message": "test"}
+
+    app.add_middleware(SecurityHeadersMiddleware)
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        with (
+            patch.object(settings, "SECURE_HEADERS", True),
+            patch.object(settings, "HTTPS_ONLY", False),
+        ):
+            response = await client.get("/test")
+
+    assert response.headers.get_list("X-Frame-Options") == ["DENY"]
+    # HSTS is only managed when HTTPS_ONLY is on
+    assert response.headers["Strict-Transport-Security"] == "max-age=60"
+    assert response.json() == {"message": "test"}
@@ -70,6 +70,22 @@ async def test_base_model_get_by_id_not_found(db: AsyncSession):
     assert result is None
 
 
+@pytest.mark.models
+def test_base_model_statement_reused():
+    """Test that named statements are built once per model."""
+    built = []
+
+    def build():
+        built.append(1)
+        return object()
+
+    first = BaseTestModel._statement("reuse_test", build)
+    second = BaseTestModel._statement("reuse_test", build)
+
+    assert first is second
+    assert len(built) == 1
+
+
 @pytest.mark.models
 @pytest.mark.asyncio
 async def test_base_model_get_all(db: AsyncSession):
@@ -155,6 +171,51 @@ async def test_base_model_delete(db: AsyncSession):
     assert deleted_item is None
 
 
+@pytest.mark.models
+@pytest.mark.asyncio
+async def test_base_model_update_by_id(db: AsyncSession):
+    """Test updating a model by ID."""
+    item = await BaseTestModel.create(db, {"name": "Original", "value": 1})
+
+    updated = await BaseTestModel.update_by_id(db, item.id, {"value": 2})
+
+    assert updated is not None
+    assert updated.name == "Original"
+    assert updated.value == 2
+
+    # Missing records return None
+    assert await BaseTestModel.update_by_id(db, 99999, {"value": 3}) is None
+
+
+@pytest.mark.models
+@pytest.mark.asyncio
+async def test_base_model_delete_by_id(db: AsyncSession):
+    """Test deleting a model by ID."""
+    item = await BaseTestModel.create(db, {"name": "Delete By ID", "value": 5})
+    item_id = item.id
+
+    deleted = await BaseTestModel.delete_by_id(db, item_id)
+
+    assert deleted is not None
+    assert deleted.name == "Delete By ID"
+    assert await BaseTestModel.get_by_id(db, item_id) is None
+    assert await BaseTestModel.delete_by_id(db, item_id) is None
+
+
+@pytest.mark.models
+@pytest.mark.asyncio
+async def test_base_model_get_by_ids(db: AsyncSession):
+    """Test fetching several models by ID in one call."""
+    first = await BaseTestModel.create(db, {"name": "First"})
+    second = await BaseTestModel.create(db, {"name": "Second"})
+
+    items = await BaseTestModel.get_by_ids(db, [first.id, second.id, first.id, 99999])
+
+    assert set(items) == {first.id, second.id}
+    assert items[second.id].name == "Second"
+    assert await BaseTestModel.get_by_ids(db, []) == {}
+
+
 @pytest.mark.models
 @pytest.mark.asyncio
 async def test_base_model_default_values(db: AsyncSession):
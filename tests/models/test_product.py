@@ -194,6 +194,84 @@ async def test_update_stock_addition(db: AsyncSession):
     assert movement.movement_type == MovementType.ADDITION
 
 
+@pytest.mark.asyncio
+async def test_adjust_stock(db: AsyncSession):
+    """Test adjusting stock by product ID."""
+    product = Product(name="Adjust Product", sku="ADJUST001", quantity=10)
+    db.add(product)
+    await db.commit()
+    await db.refresh(product)
+
+    updated_product = await Product.adjust_stock(db, product.id, -4)
+    assert updated_product.quantity == 6
+
+    movements = await db.execute(
+        select(StockMovement).where(StockMovement.product_id == product.id)
+    )
+    movement = movements.scalar_one()
+    assert movement.quantity == 4
+    assert movement.movement_type == MovementType.REMOVAL
+
+    # Changes that would make stock negative are refused
+    assert await Product.adjust_stock(db, product.id, -7) is None
+    assert await Product.adjust_stock(db, 99999, 1) is None
+
+
+@pytest.mark.asyncio
+async def test_adjust_stock_many(db: AsyncSession):
+    """Test adjusting the stock of several products in one statement."""
+    first = Product(name="Bulk One", sku="BULK001", quantity=10)
+    second = Product(name="Bulk Two", sku="BULK002", quantity=3)
+    db.add_all([first, second])
+    await db.commit()
+
+    updated = await Product.adjust_stock_many(
+        db, {first.id: -4, second.id: -5, 99999: 1}, is_sale=True
+    )
+
+    # The second change would make stock negative; 99999 does not exist
+    assert updated == {first.id}
+    assert await Product.get_stock_fields(db, first.id) == (6, 10, "Bulk One")
+    assert await Product.get_stock_fields(db, second.id) == (3, 10, "Bulk Two")
+
+    movements = await db.execute(select(StockMovement))
+    movement = movements.scalar_one()
+    assert movement.product_id == first.id
+    assert movement.quantity == 4
+    assert movement.movement_type == MovementType.SALE
+
+    assert await Product.adjust_stock_many(db, {}) == set()
+
+
+@pytest.mark.asyncio
+async def test_create_if_sku_free(db: AsyncSession):
+    """Test creating a product only when its SKU is unused."""
+    product = await Product.create_if_sku_free(
+        db, {"name": "Unique Product", "sku": "UNIQUE001", "price": 2.5}
+    )
+    assert product.id is not None
+    assert product.name == "Unique Product"
+    assert product.category == ProductCategory.OTHER
+    assert product.reorder_level == 10
+
+    duplicate = await Product.create_if_sku_free(
+        db, {"name": "Duplicate Product", "sku": "UNIQUE001"}
+    )
+    assert duplicate is None
+
+
+@pytest.mark.asyncio
+async def test_get_stock_fields(db: AsyncSession):
+    """Test fetching only the stock-related columns of a product."""
+    product = Product(name="Fields Product", sku="FIELDS001", quantity=3)
+    db.add(product)
+    await db.commit()
+    await db.refresh(product)
+
+    assert await Product.get_stock_fields(db, product.id) == (3, 10, "Fields Product")
+    assert await Product.get_stock_fields(db, 99999) is None
+
+
 @pytest.mark.asyncio
 async def test_update_stock_removal(db: AsyncSession):
     """Test updating stock with removal."""
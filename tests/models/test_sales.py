@@ -5,6 +5,7 @@ Tests for sales models.
 from datetime import datetime, timedelta, timezone
 
 import pytest
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.inventory import Product, ProductCategory
@@ -211,6 +212,38 @@ async def test_order_get_by_id_not_found(db: AsyncSession):
     assert result is None
 
 
+@pytest.mark.models
+@pytest.mark.asyncio
+async def test_order_load_items(db: AsyncSession):
+    """Test that load_items only queries items that were not preloaded."""
+    product = Product(name="Load Product", sku="LOAD001", quantity=10)
+    order = Order(customer_name="Load Customer")
+    db.add_all([product, order])
+    await db.commit()
+
+    db.add(OrderItem(order_id=order.id, product_id=product.id, quantity=2))
+    await db.commit()
+
+    # A bare order loads its items on demand
+    items = await order.load_items(db)
+    assert [item.quantity for item in items] == [2]
+
+    # A preloaded order is served without another query
+    statements = []
+
+    def count(*args):
+        statements.append(args)
+
+    preloaded = await Order.get_by_id(db, order.id)
+    sync_engine = db.get_bind()
+    event.listen(sync_engine, "before_cursor_execute", count)
+    try:
+        assert len(await preloaded.load_items(db)) == 1
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", count)
+    assert statements == []
+
+
 @pytest.mark.models
 @pytest.mark.asyncio
 async def test_order_get_all(db: AsyncSession):
@@ -232,6 +265,13 @@ async def test_order_get_all(db: AsyncSession):
     paginated_orders = await Order.get_all(db, skip=0, limit=2)
     assert len(paginated_orders) == 2
 
+    # Items are only preloaded on request
+    db.expunge_all()
+    assert "items" not in (await Order.get_all(db, limit=1))[0].__dict__
+    db.expunge_all()
+    with_items = await Order.get_all(db, limit=1, with_items=True)
+    assert with_items[0].items == []
+
 
 @pytest.mark.models
 @pytest.mark.asyncio
@@ -267,6 +307,100 @@ async def test_order_get_by_date_range(db: AsyncSession):
     assert len(future_orders) == 0
 
 
+@pytest.mark.models
+@pytest.mark.asyncio
+async def test_order_get_sales_totals(db: AsyncSession):
+    """Test aggregating completed sales within a date range."""
+    product = Product(name="Totals Product", sku="TOTALS001", price=4.0, quantity=50)
+    db.add(product)
+    await db.commit()
+    await db.refresh(product)
+
+    completed = Order(
+        customer_name="Completed", status=OrderStatus.COMPLETED, total_amount=9.5
+    )
+    empty = Order(customer_name="No Items", status=OrderStatus.COMPLETED)
+    pending = Order(customer_name="Pending", total_amount=20.0)
+    db.add_all([completed, empty, pending])
+    await db.commit()
+
+    db.add_all(
+        [
+            OrderItem(
+                order_id=completed.id, product_id=product.id, quantity=2, unit_price=4.0
+            ),
+            OrderItem(
+                order_id=completed.id, product_id=product.id, quantity=1, unit_price=1.5
+            ),
+            OrderItem(
+                order_id=pending.id, product_id=product.id, quantity=5, unit_price=4.0
+            ),
+        ]
+    )
+    await db.commit()
+
+    now = datetime.now()
+    total_sales, order_count = await Order.get_sales_totals(
+        db, now - timedelta(days=1), now + timedelta(days=1)
+    )
+    assert total_sales == 9.5
+    assert order_count == 2
+
+    total_sales, order_count = await Order.get_sales_totals(
+        db, now + timedelta(days=2), now + timedelta(days=3)
+    )
+    assert total_sales == 0.0
+    assert order_count == 0
+
+
+@pytest.mark.models
+@pytest.mark.asyncio
+async def test_order_get_daily_sales_totals(db: AsyncSession):
+    """Test grouping completed sales by day."""
+    product = Product(name="Daily Product", sku="DAILY001", price=3.0, quantity=50)
+    db.add(product)
+    await db.commit()
+    await db.refresh(product)
+
+    now = datetime.now()
+    earlier = Order(
+        customer_name="Earlier",
+        status=OrderStatus.COMPLETED,
+        total_amount=3.0,
+        created_at=now - timedelta(days=2),
+    )
+    today_orders = [
+        Order(
+            customer_name=f"Today {i}", status=OrderStatus.COMPLETED, total_amount=3.0
+        )
+        for i in range(2)
+    ]
+    db.add_all([earlier, *today_orders])
+    await db.commit()
+
+    db.add_all(
+        [
+            OrderItem(
+                order_id=order.id, product_id=product.id, quantity=1, unit_price=3.0
+            )
+            for order in [earlier, *today_orders]
+        ]
+    )
+    await db.commit()
+
+    daily = await Order.get_daily_sales_totals(
+        db, now - timedelta(days=3), now + timedelta(days=1)
+    )
+    assert daily == [
+        {
+            "date": (now - timedelta(days=2)).date().isoformat(),
+            "total_sales": 3.0,
+            "order_count": 1,
+        },
+        {"date": now.date().isoformat(), "total_sales": 6.0, "order_count": 2},
+    ]
+
+
 @pytest.mark.models
 @pytest.mark.asyncio
 async def test_payment_method_enum():
@@ -397,6 +531,62 @@ async def test_order_complete(db: AsyncSession):
     assert product.quantity == initial_stock - 5
 
 
+@pytest.mark.models
+@pytest.mark.asyncio
+async def test_order_complete_insufficient_stock(db: AsyncSession):
+    """Test that completing an order never takes stock below zero."""
+    plenty = Product(name="Plenty Product", sku="PLENTY001", quantity=10)
+    scarce = Product(name="Scarce Product", sku="SCARCE001", quantity=1)
+    order = Order(customer_name="Oversell Customer")
+    db.add_all([plenty, scarce, order])
+    await db.commit()
+
+    db.add_all(
+        [
+            OrderItem(order_id=order.id, product_id=plenty.id, quantity=3),
+            OrderItem(order_id=order.id, product_id=scarce.id, quantity=2),
+        ]
+    )
+    await db.commit()
+
+    with pytest.raises(ValueError):
+        await order.complete(db)
+
+    # Neither the order nor any stock level was changed
+    await db.refresh(order)
+    await db.refresh(plenty)
+    await db.refresh(scarce)
+    assert order.status == OrderStatus.PENDING
+    assert plenty.quantity == 10
+    assert scarce.quantity == 1
+
+
+@pytest.mark.models
+@pytest.mark.asyncio
+async def test_order_complete_deleted_product(db: AsyncSession):
+    """Test that completing an order skips products deleted since."""
+    kept = Product(name="Kept Product", sku="KEPT001", quantity=10)
+    deleted = Product(name="Deleted Product", sku="GONE001", quantity=10)
+    order = Order(customer_name="Deleted Product Customer")
+    db.add_all([kept, deleted, order])
+    await db.commit()
+
+    db.add_all(
+        [
+            OrderItem(order_id=order.id, product_id=kept.id, quantity=3),
+            OrderItem(order_id=order.id, product_id=deleted.id, quantity=2),
+        ]
+    )
+    await db.commit()
+    await Product.delete_by_id(db, deleted.id)
+
+    completed_order = await order.complete(db)
+
+    assert completed_order.status == OrderStatus.COMPLETED
+    await db.refresh(kept)
+    assert kept.quantity == 7
+
+
 @pytest.mark.models
 @pytest.mark.asyncio
 async def test_order_complete_already_completed(db: AsyncSession):
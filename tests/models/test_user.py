@@ -1,7 +1,10 @@
+import time
+from unittest.mock import patch
+
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.user import User, UserRole
+from app.models.user import _USER_CACHE, User, UserRole
 
 
 @pytest.mark.asyncio
@@ -311,3 +314,57 @@ async def test_user_role_enum_values():
     assert UserRole.ADMIN in roles
     assert UserRole.MANAGER in roles
     assert UserRole.CASHIER in roles
+
+
+@pytest.mark.asyncio
+async def test_user_get_cached(db: AsyncSession):
+    """Test that cached users skip the query until the row changes."""
+    user = await User.create(
+        db,
+        obj_in={
+            "email": "cached@example.com",
+            "password": "password123",
+            "full_name": "Cached User",
+        },
+    )
+
+    loaded = await User.get_cached(db, user.id)
+    assert loaded.email == "cached@example.com"
+
+    with patch.object(User, "get_by_id", side_effect=AssertionError("queried")):
+        cached = await User.get_cached(db, user.id)
+    assert cached.id == user.id
+    assert cached.full_name == "Cached User"
+
+    await user.update_password(db, "newpassword123")
+
+    with patch.object(User, "get_by_id", wraps=User.get_by_id) as mock_get:
+        refreshed = await User.get_cached(db, user.id)
+    mock_get.assert_called_once()
+    assert refreshed.verify_password("newpassword123")
+
+
+@pytest.mark.asyncio
+async def test_user_cache_invalidated_on_commit(db: AsyncSession):
+    """Test that a snapshot cached between flush and commit is dropped."""
+    user = await User.create(
+        db,
+        obj_in={
+            "email": "deactivated@example.com",
+            "password": "password123",
+            "full_name": "Deactivated User",
+        },
+    )
+
+    user.is_active = False
+    db.add(user)
+    await db.flush()
+
+    # A concurrent request re-caches the still-committed row after the flush
+    _USER_CACHE[user.id] = (time.monotonic() + 30, {"id": user.id})
+
+    await db.commit()
+    assert user.id not in _USER_CACHE
+
+    refreshed = await User.get_cached(db, user.id)
+    assert refreshed.is_active is False
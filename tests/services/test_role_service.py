@@ -77,9 +77,9 @@ async def test_create_custom_role():
     role_data = await RoleService.create_custom_role(role_name, {perm1, perm2})
 
     # Check the returned data
-    assert role_data["name"] == role_name
-    assert perm1 in role_data["permissions"]
-    assert perm2 in role_data["permissions"]
+    assert role_data.name == role_name
+    assert perm1 in role_data.permissions
+    assert perm2 in role_data.permissions
 
     # Check if the role was actually created
     role_permissions = PermissionRegistry.get_role_permissions(role_name)
@@ -116,9 +116,9 @@ async def test_update_custom_role():
     role_data = await RoleService.update_custom_role(role_name, {perm1, perm2})
 
     # Check the returned data
-    assert role_data["name"] == role_name
-    assert perm1 in role_data["permissions"]
-    assert perm2 in role_data["permissions"]
+    assert role_data.name == role_name
+    assert perm1 in role_data.permissions
+    assert perm2 in role_data.permissions
 
     # Check if the role was actually updated
     role_permissions = PermissionRegistry.get_role_permissions(role_name)
@@ -149,8 +149,8 @@ async def test_delete_custom_role(db: AsyncSession):
     role_data = await RoleService.delete_custom_role(role_name, db)
 
     # Check the returned data
-    assert role_data["name"] == role_name
-    assert perm in role_data["permissions"]
+    assert role_data.name == role_name
+    assert perm in role_data.permissions
 
     # Check if the role was actually deleted
     with pytest.raises(HTTPException):
@@ -163,3 +163,21 @@ async def test_delete_custom_role(db: AsyncSession):
     # Test deleting a standard role
     with pytest.raises(HTTPException):
         await RoleService.delete_custom_role("admin", db)
+
+
+@pytest.mark.asyncio
+async def test_get_all_roles_cache_invalidation(db: AsyncSession):
+    """Test that cached role listings follow registry changes."""
+    perm = "test:roles_cache"
+    PermissionRegistry.register_permission(perm)
+
+    roles = await RoleService.get_all_roles()
+    assert await RoleService.get_all_roles() is roles
+
+    role_name = "test_custom_role_cache"
+    await RoleService.create_custom_role(role_name, {perm})
+    roles = await RoleService.get_all_roles()
+    assert roles[role_name] == [perm]
+
+    await RoleService.delete_custom_role(role_name, db)
+    assert role_name not in await RoleService.get_all_roles()
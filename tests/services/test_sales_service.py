@@ -63,6 +63,7 @@ async def test_order_query_manager_filter_for_user():
     # Test filtering for anonymous (should see no orders)
     anon_query = manager.filter_for_user(query, None)
     assert str(anon_query) != str(query)
+    assert manager.filter_for_user(select(Order).limit(5), None) is anon_query
 
 
 @pytest.mark.asyncio
@@ -13,6 +13,12 @@ from httpx._transports.asgi import ASGITransport
 from app.utils.middleware import RequestLoggingMiddleware
 
 
+def _rendered(call) -> str:
+    """Render a mocked logger call's %-style message with its arguments."""
+    msg, *args = call[0]
+    return msg % tuple(args)
+
+
 @pytest.mark.utils
 @pytest.mark.asyncio
 async def test_request_logging_middleware_success():
@@ -39,12 +45,12 @@ async def test_request_logging_middleware_success():
             assert mock_logger.info.call_count == 2
 
             # Check start log
-            start_call = mock_logger.info.call_args_list[0][0][0]
+            start_call = _rendered(mock_logger.info.call_args_list[0])
             assert "Request started: GET /test" in start_call
             assert "from" in start_call
 
             # Check completion log
-            completion_call = mock_logger.info.call_args_list[1][0][0]
+            completion_call = _rendered(mock_logger.info.call_args_list[1])
             assert "Request completed: GET /test" in completion_call
             assert "Status: 200" in completion_call
             assert "Duration:" in completion_call
@@ -76,11 +82,11 @@ async def test_request_logging_middleware_with_exception():
             assert mock_logger.error.call_count == 1  # Error log
 
             # Check start log
-            start_call = mock_logger.info.call_args_list[0][0][0]
+            start_call = _rendered(mock_logger.info.call_args_list[0])
             assert "Request started: GET /error" in start_call
 
             # Check error log
-            error_call = mock_logger.error.call_args_list[0][0][0]
+            error_call = _rendered(mock_logger.error.call_args_list[0])
             assert "Request failed: GET /error" in error_call
             assert "Error: Test error" in error_call
 
@@ -131,7 +137,7 @@ async def test_request_logging_middleware_timing():
             assert process_time >= 0.1  # Should be at least 100ms
 
             # Check completion log includes duration
-            completion_call = mock_logger.info.call_args_list[1][0][0]
+            completion_call = _rendered(mock_logger.info.call_args_list[1])
             assert "Duration:" in completion_call
 
 
@@ -166,7 +172,7 @@ async def test_request_logging_middleware_different_methods():
             assert mock_logger.info.call_count == 4
 
             # Check that different methods are logged correctly
-            calls = [call[0][0] for call in mock_logger.info.call_args_list]
+            calls = [_rendered(call) for call in mock_logger.info.call_args_list]
             assert any("POST /test" in call for call in calls)
             assert any("PUT /test" in call for call in calls)
 